@@ -5,16 +5,23 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import Engine
 
+from app.utils.credits_rate import CreditsRate
+
 if TYPE_CHECKING:
 
     from app.services import (
         Authentication,
+        CustomerProvisioner,
         Email,
+        EmailQueue,
+        ExpirySweeper,
         OTP,
+        Password,
         Session,
         Transaction,
         User,
-        Stripe
+        Stripe,
+        StripeEvents
     )
 
 
@@ -22,21 +29,28 @@ if TYPE_CHECKING:
 engine: Engine = None
 table_creation_required: bool = True
 
-credits_rate = [{
+default_credits_rate = [{
     "lower_limit": 5,
     "upper_limit": 10000,
     "rate": 100,
     "stripe_price_id": os.getenv("STRIPE_PRICE_ID"),
 }]
 
+credits_rate = CreditsRate(default_credits_rate)
+
 
 class ServiceConfig:
     """Service configuration."""
 
     authentication: "Authentication" = None
+    customer_provisioner: "CustomerProvisioner" = None
     email: "Email" = None
+    email_queue: "EmailQueue" = None
+    expiry_sweeper: "ExpirySweeper" = None
     otp: "OTP" = None
+    password: "Password" = None
     stripe: "Stripe" = None
+    stripe_events: "StripeEvents" = None
     session: "Session" = None
     transaction: "Transaction" = None
     user: "User" = None
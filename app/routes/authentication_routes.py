@@ -6,7 +6,6 @@ import string
 import time
 from typing import List
 
-import bcrypt
 from flask import request, Response as FlaskResponse
 from google.oauth2 import id_token
 from google.auth.transport import requests
@@ -19,7 +18,9 @@ import app.data
 from app.schemas import Session as SessionModel
 from app.schemas import User as UserModel
 from app.schemas.database.otp import OTPType
+from app.schemas.database.outbound_email import OutboundEmailType
 from app.utils.api_responses import APIResponse
+from app.utils.serializers import user_serializer
 
 
 
@@ -57,25 +58,14 @@ class AuthenticationRoute:
                 raise ValueError
 
             try:
-                user = app.data.ServiceConfig.user.create(first_name, last_name, email, password)
+                user, session, otp = app.data.ServiceConfig.user.signup(first_name, last_name, email, password, otp_type = OTPType.ACTIVATION)
 
             except ValueError:
                 return APIResponse.resource_presence_error("User", True)
 
-            otp = app.data.ServiceConfig.otp.create(user.id, OTPType.ACTIVATION)
+            app.data.ServiceConfig.email_queue.enqueue(OutboundEmailType.WELCOME, user.email, code = otp.code, user_id = user.id, user_token = session.token)
             
-            session = app.data.ServiceConfig.session.create(user.id)
-            
-            app.data.ServiceConfig.email.welcome(user.email, otp.code, user.id, session.token)
-            
-            user = user.model_dump()
-            user["token"] = session.token
-
-            if kwargs["role"] != os.getenv("PRIVATE_ROLE"):
-
-                del user["password"]
-                del user["stripe_customer_id"]
-                del user["google_user_id"]
+            user = user_serializer.for_role(kwargs["role"])(user, token = session.token)
 
             return APIResponse.success("User registered successfully.", user, 201)
  
@@ -127,20 +117,16 @@ class AuthenticationRoute:
 
                 password = "".join(secrets.choice(string.ascii_letters + string.digits + string.punctuation) for _ in range(16))
 
-                user = app.data.ServiceConfig.user.create(first_name, None, email, password, google_user_id = google_user_id, is_active = True)
+                user, session, _ = app.data.ServiceConfig.user.signup(first_name, None, email, password, google_user_id = google_user_id, is_active = True)
 
-                app.data.ServiceConfig.email.password(email, password)
+                app.data.ServiceConfig.email_queue.enqueue(OutboundEmailType.PASSWORD, email, password = password)
 
                 message = "User registered successfully."
 
-            session = app.data.ServiceConfig.session.create(user.id)
-            
-            user = user.model_dump()
-            user["token"] = session.token
+            else:
+                session = app.data.ServiceConfig.session.create(user.id)
 
-            del user["password"]
-            del user["stripe_customer_id"]
-            del user["google_user_id"]
+            user = user_serializer.public(user, token = session.token)
 
             return APIResponse.success(message, user, 201)
  
@@ -198,12 +184,7 @@ class AuthenticationRoute:
 
                 app.data.ServiceConfig.otp.delete(user.id, OTPType.TWO_FACTOR_AUTH)
             
-            user = user.model_dump()
-            del user["password"]
-            del user["stripe_customer_id"]
-            del user["google_user_id"]
-            
-            user["token"] = kwargs["token"]
+            user = user_serializer.public(user, token = kwargs["token"])
 
             return APIResponse.success("User logged in successfully.", user)
 
@@ -301,18 +282,11 @@ class AuthenticationRoute:
             if time.time() > otp.expires_at.timestamp():
                 return APIResponse.authentication_error()
 
-            app.data.ServiceConfig.user.update(user.id, UserModel.id, password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8"))
+            app.data.ServiceConfig.user.update(user.id, UserModel.id, password = app.data.ServiceConfig.password.hash(password))
 
             app.data.ServiceConfig.otp.delete(user.id, OTPType.CHANGE_PASSWORD)
 
-            user_sessions = app.data.ServiceConfig.session.view_all(user.id)
-
-            for session in user_sessions:
-
-                if token and session.token == token:
-                    continue
-
-                app.data.ServiceConfig.session.delete(session.id, SessionModel.id)
+            app.data.ServiceConfig.session.revoke_all(user.id, except_token = token)
 
             return APIResponse.success("User password changed successfully.", None, 200)
  
@@ -334,7 +308,7 @@ class AuthenticationRoute:
 
             otp = app.data.ServiceConfig.otp.create(user.id, otp_type)
 
-            app.data.ServiceConfig.email.otp(user.email, otp.code)
+            app.data.ServiceConfig.email_queue.enqueue(OutboundEmailType.OTP, user.email, code = otp.code)
 
             return APIResponse.success("OTP sent successfully.", None, 201)
  
@@ -386,10 +360,7 @@ class AuthenticationRoute:
 
             app.data.ServiceConfig.otp.delete(user.id, OTPType.ACTIVATION)
 
-            user = user.model_dump()
-            del user["password"]
-            del user["stripe_customer_id"]
-            del user["google_user_id"]
+            user = user_serializer.public(user)
 
             return APIResponse.success("User activated successfully.", user, 200)
  
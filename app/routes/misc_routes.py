@@ -3,6 +3,8 @@
 import os
 from flask import Response as FlaskResponse
 
+import app.data
+from app.services import Database
 from app.utils.api_responses import APIResponse
 
 
@@ -21,3 +23,19 @@ class MiscRoute:
         """Version check."""
 
         return APIResponse.success("Version check successful.", {"version": os.getenv("VERSION")}, 200)
+
+    @staticmethod
+    @app.data.ServiceConfig.authentication.private_authentication
+    def metrics(*_args, **_kwargs) -> FlaskResponse:
+        """View the runtime metrics of this worker."""
+
+        metrics = {
+            "database_pool": Database.pool_statistics(),
+            "database_queries": Database.query_statistics(),
+            "query_cache": Database.query_cache_statistics(),
+            "token_cache": app.data.ServiceConfig.authentication.token_cache.statistics(),
+            "password_hashing": app.data.ServiceConfig.password.statistics(),
+            "stripe": app.data.ServiceConfig.stripe.statistics(),
+        }
+
+        return APIResponse.success("Metrics fetched successfully.", metrics, 200)
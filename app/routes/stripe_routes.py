@@ -1,14 +1,15 @@
 """Routes for stripe operations."""
 
 import os
+from typing import Dict
 
 from flask import request, Response as FlaskResponse
-from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 
 import app.data
-from app.schemas.database.transaction import TransactionType
+from app.error_handing import StripeError
 from app.schemas import User as UserModel
-from app.utils.api_responses import APIResponse
+from app.utils.api_responses import APIResponse, envelope
 
 
 
@@ -16,12 +17,39 @@ class StripeRoute:
 
     """Stripe route functions."""
 
+    rate_bodies: Dict[str, bytes] = {}
+    ignored_event_body = envelope("success", "Event ignored.")
+
     @staticmethod
     @app.data.ServiceConfig.authentication.general_authentication_active
     def rate(*_args, **_kwargs) -> FlaskResponse:
         """View credits rate."""
 
-        return APIResponse.success("Credits rate fetched successfully. Upper limit and lower limit are in fiat. Rate is in credits per dollar. Any amount beyond the limits will not be credited.", app.data.credits_rate, 200)
+        snapshot = app.data.credits_rate.current()
+
+        if snapshot.etag in request.if_none_match:
+
+            response = FlaskResponse(status = 304)
+            response.set_etag(snapshot.etag)
+
+            return response
+
+        body = StripeRoute.rate_bodies.get(snapshot.etag, None)
+
+        if body is None:
+
+            body = envelope(
+                "success",
+                "Credits rate fetched successfully. Upper limit and lower limit are in fiat. Rate is in credits per dollar. Any amount beyond the limits will not be credited.",
+                [dict(tier) for tier in snapshot.tiers]
+            )
+
+            StripeRoute.rate_bodies = {snapshot.etag: body}
+
+        response = APIResponse.raw(body, 200)
+        response.set_etag(snapshot.etag)
+
+        return response
 
     @staticmethod
     @app.data.ServiceConfig.authentication.general_authentication_active
@@ -36,7 +64,13 @@ class StripeRoute:
 
         user: UserModel = kwargs["user"]
 
-        customer_portal_session = app.data.ServiceConfig.stripe.create_customer_portal_session(user.stripe_customer_id)
+        try:
+            customer_id = app.data.ServiceConfig.customer_provisioner.customer_id(user)
+
+        except ValueError:
+            return APIResponse.resource_presence_error("User")
+
+        customer_portal_session = app.data.ServiceConfig.stripe.create_customer_portal_session(customer_id)
 
         customer_portal_session = {
             "url": customer_portal_session.url,
@@ -76,13 +110,20 @@ class StripeRoute:
             amount: int = int(payload["amount"])
             return_path = payload["return_path"]
 
-            applicable_credits_rate = [rate for rate in app.data.credits_rate if rate["lower_limit"] <= amount <= rate["upper_limit"]]
+            applicable_credits_rate = app.data.credits_rate.lookup(amount)
 
             if not applicable_credits_rate:
                 return APIResponse.credits_rate_not_found_error()
 
-            value_in_credits = applicable_credits_rate[0]["rate"] * amount
-            checkout_session = app.data.ServiceConfig.stripe.create_checkout_session(user.stripe_customer_id, applicable_credits_rate[0]["stripe_price_id"], value_in_credits, amount, user.id, return_path)
+            value_in_credits = applicable_credits_rate["rate"] * amount
+
+            try:
+                customer_id = app.data.ServiceConfig.customer_provisioner.customer_id(user)
+
+            except ValueError:
+                return APIResponse.resource_presence_error("User")
+
+            checkout_session = app.data.ServiceConfig.stripe.create_checkout_session(customer_id, applicable_credits_rate["stripe_price_id"], value_in_credits, amount, user.id, return_path)
 
             checkout_session = {
                 "return_path": return_path,
@@ -98,34 +139,31 @@ class StripeRoute:
 
     @staticmethod
     def settle(*_args, **_kwargs) -> FlaskResponse:
-        """Settle a checkout session payment."""
+        """Record a checkout session payment, credits are settled by the event worker."""
 
         try:
 
-            try:
-                event_data = app.data.ServiceConfig.stripe.settle_checkout_session(request.data, request.headers["Stripe-Signature"])
+            webhook_body = request.get_data()
 
-            except ValueError:
-                return APIResponse.schema_error()
+            if app.data.ServiceConfig.stripe.ignores_event(webhook_body):
+                return APIResponse.raw(StripeRoute.ignored_event_body, 200)
 
             try:
+                event = app.data.ServiceConfig.stripe.verify_webhook_event(webhook_body, request.headers["Stripe-Signature"])
 
-                value_in_fiat = float(event_data["metadata"]["value_in_fiat"])
-                value_in_credits = float(event_data["metadata"]["value_in_credits"])
+            except StripeError:
+                return APIResponse.authentication_error()
 
-                app.data.ServiceConfig.user.update_credits(
-                    event_data["metadata"]["user_id"],
-                    UserModel.id,
-                    value_in_credits,
-                    payment_intent = event_data["payment_intent"],
-                    transaction_description = f"User bought {value_in_credits} credits for ${value_in_fiat}.",
-                    transaction_type = TransactionType.CREDIT
-                )
+            if event.type not in app.data.ServiceConfig.stripe.handled_event_types:
+                return APIResponse.raw(StripeRoute.ignored_event_body, 200)
 
-            except ValidationError as exc:
-                raise ValueError from exc
-                
-            return APIResponse.success("Checkout session settled successfully.", None, 200)
+            try:
+                app.data.ServiceConfig.stripe_events.record(event)
+
+            except SQLAlchemyError:
+                return APIResponse.unidentified_error()
+
+            return APIResponse.success("Checkout session received successfully.", None, 200)
  
         except (KeyError, ValueError):
             return APIResponse.schema_error()
@@ -10,6 +10,7 @@ import app.data
 from app.schemas import User as UserModel
 from app.schemas.database.transaction import TransactionType
 from app.utils.api_responses import APIResponse
+from app.utils.serializers import transaction_serializer
 
 
 
@@ -39,15 +40,26 @@ class TransactionRoute:
                 if user.id != user_id:
                     return APIResponse.resource_access_error()
 
-            limit: int = int(request.args.get("limit", None))
-            offset: int = int(request.args.get("offset", None))
+            if "offset" in request.args:
 
-            transactions = [transaction.model_dump() for transaction in app.data.ServiceConfig.transaction.view_all(user_id, limit, offset)]
+                limit: int = int(request.args.get("limit", None))
+                offset: int = int(request.args.get("offset", None))
 
-            for i, _ in enumerate(transactions):
-                del transactions[i]["stripe_payment_intent"]
+                transactions = transaction_serializer.public.many(app.data.ServiceConfig.transaction.view_all(user_id, limit, offset, transaction_serializer.public.columns))
 
-            return APIResponse.success("Transactions fetched successfully.", transactions, 200)
+                return APIResponse.success("Transactions fetched successfully.", transactions, 200)
+
+            limit: int = int(request.args.get("limit", 100))
+            cursor: str = request.args.get("cursor", None)
+
+            transactions, next_cursor = app.data.ServiceConfig.transaction.view_page(user_id, limit, cursor, transaction_serializer.public.columns)
+
+            page = {
+                "transactions": transaction_serializer.public.many(transactions),
+                "next_cursor": next_cursor,
+            }
+
+            return APIResponse.success("Transactions fetched successfully.", page, 200)
  
         except (TypeError, ValueError):
             return APIResponse.schema_error()
@@ -75,8 +87,7 @@ class TransactionRoute:
         except ValueError:
             return APIResponse.resource_presence_error("Transaction")
 
-        transaction = transaction.model_dump()
-        del transaction["stripe_payment_intent"]
+        transaction = transaction_serializer.public(transaction)
 
         return APIResponse.success("Transaction fetched successfully.", transaction, 200)
 
@@ -118,7 +129,7 @@ class TransactionRoute:
             except ValidationError as exc:
                 raise ValueError from exc
 
-            transaction = transaction.model_dump()
+            transaction = transaction_serializer.private(transaction)
 
             return APIResponse.success("Transaction created successfully.", transaction, 201)
  
@@ -174,7 +185,7 @@ class TransactionRoute:
             except ValueError:
                 return APIResponse.resource_presence_error("Transaction")
 
-            transaction = transaction.model_dump()
+            transaction = transaction_serializer.private(transaction)
 
             return APIResponse.success("Transaction updated successfully.", transaction, 200)
  
@@ -2,13 +2,14 @@
 
 import os
 
-from flask import request, Response as FlaskResponse
+from flask import request, Response as FlaskResponse, stream_with_context
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
 import app.data
 from app.schemas import User as UserModel
-from app.utils.api_responses import APIResponse
+from app.utils.api_responses import APIResponse, serialize
+from app.utils.serializers import user_serializer
 
 
 
@@ -23,10 +24,24 @@ class UserRoute:
 
         try:
 
+            if request.args.get("format", None) == "ndjson":
+
+                batch_size: int = int(request.args.get("batch_size", 1000))
+
+                if batch_size <= 0:
+                    raise ValueError
+
+                def export():
+
+                    for user in app.data.ServiceConfig.user.stream_all(batch_size, user_serializer.private.columns):
+                        yield serialize(user_serializer.private(user))
+
+                return FlaskResponse(stream_with_context(export()), 200, mimetype = "application/x-ndjson")
+
             limit: int = int(request.args.get("limit", None))
             offset: int = int(request.args.get("offset", None))
 
-            users = [user.model_dump() for user in app.data.ServiceConfig.user.view_all(limit, offset)]
+            users = user_serializer.private.many(app.data.ServiceConfig.user.view_all(limit, offset, user_serializer.private.columns))
 
             return APIResponse.success("Users fetched successfully.", users, 200)
  
@@ -53,12 +68,7 @@ class UserRoute:
             if user.id != user_id:
                 return APIResponse.resource_access_error()
 
-        user = user.model_dump()
-        del user["password"]
-        del user["stripe_customer_id"]
-        del user["google_user_id"]
-
-        return APIResponse.success("User fetched successfully.", user, 200)
+        return APIResponse.success("User fetched successfully.", user_serializer.public(user), 200)
 
     @staticmethod
     @app.data.ServiceConfig.authentication.general_authentication_inactive
@@ -112,12 +122,7 @@ class UserRoute:
             except ValueError:
                 return APIResponse.resource_presence_error("User")
 
-            user = user.model_dump()
-            del user["password"]
-            del user["stripe_customer_id"]
-            del user["google_user_id"]
-
-            return APIResponse.success("User updated successfully.", user, 200)
+            return APIResponse.success("User updated successfully.", user_serializer.public(user), 200)
  
         except (KeyError, ValueError, ValidationError, SQLAlchemyError):
             return APIResponse.schema_error()
@@ -154,16 +159,56 @@ class UserRoute:
             except ValueError:
                 return APIResponse.resource_presence_error("User")
 
-            user = app.data.ServiceConfig.user.view(user_id, UserModel.id).model_dump()
-            del user["password"]
-            del user["stripe_customer_id"]
-            del user["google_user_id"]
+            user = app.data.ServiceConfig.user.view(user_id, UserModel.id)
 
-            return APIResponse.success("User's credits updated successfully.", user, 200)
+            return APIResponse.success("User's credits updated successfully.", user_serializer.public(user), 200)
  
         except (KeyError, ValueError, ValidationError, SQLAlchemyError):
             return APIResponse.schema_error()
 
+    @staticmethod
+    @app.data.ServiceConfig.authentication.private_authentication
+    def bulk_update_credits(*_args, **_kwargs) -> FlaskResponse:
+        """Apply credit adjustments to many users."""
+
+        try:
+
+            try:
+                payload = request.json
+                
+            except Exception as exc: # pylint: disable = W0718
+
+                if request.is_json:
+                    raise ValueError from exc
+
+                else:
+                    return APIResponse.empty_body_error()
+
+            if not request.is_json or not payload:
+                return APIResponse.empty_body_error()
+
+            adjustments: list = payload["adjustments"]
+
+            if not isinstance(adjustments, list) or not adjustments:
+                raise ValueError
+
+            results = app.data.ServiceConfig.user.bulk_update_credits(adjustments)
+
+            summary = {
+                "applied": sum(1 for result in results if result["status"] == "applied"),
+                "failed": sum(1 for result in results if result["status"] == "failed"),
+                "results": results,
+            }
+
+            # A chunk that could not be written is a partial outcome, not a success.
+            if summary["failed"]:
+                return APIResponse.success("Some users' credits could not be updated.", summary, 207)
+
+            return APIResponse.success("Users' credits updated successfully.", summary, 200)
+ 
+        except (KeyError, TypeError, ValueError):
+            return APIResponse.schema_error()
+
     @staticmethod
     @app.data.ServiceConfig.authentication.private_authentication
     def delete(user_id: str, *_args, **_kwargs) -> FlaskResponse:
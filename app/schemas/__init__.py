@@ -1,14 +1,16 @@
 """Schemas for all services."""
 
 from app.schemas.api import Response
-from app.schemas.database import OTP, Session, Transaction, User
+from app.schemas.database import OTP, OutboundEmail, Session, StripeEvent, Transaction, User
 
 
 
 __all__ = [
     "Response",
     "OTP",
+    "OutboundEmail",
     "Session",
+    "StripeEvent",
     "Transaction",
     "User",
 ]
\ No newline at end of file
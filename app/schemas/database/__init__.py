@@ -1,7 +1,9 @@
 """Database schemas package."""
 
 from app.schemas.database.otp import OTP
+from app.schemas.database.outbound_email import OutboundEmail
 from app.schemas.database.session import Session
+from app.schemas.database.stripe_event import StripeEvent
 from app.schemas.database.transaction import Transaction
 from app.schemas.database.user import User
 
@@ -9,7 +11,9 @@ from app.schemas.database.user import User
 
 __all__ = [
     "OTP",
+    "OutboundEmail",
     "Session",
+    "StripeEvent",
     "Transaction",
     "User",
 ]
@@ -61,7 +61,7 @@ class OTP(SQLModel, table = True):
     )
     expires_at: datetime = Field(
         default_factory = generate_otp_expiry,
-        sa_column = Column(DateTime(timezone = True), nullable = False)
+        sa_column = Column(DateTime(timezone = True), index = True, nullable = False)
     )
     created_at: datetime = Field(
         default_factory = lambda: datetime.now(timezone.utc),
@@ -0,0 +1,91 @@
+"""Outbound email database schema."""
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Optional
+import uuid
+
+from sqlalchemy import Column, DateTime, func, Integer, JSON, String, Enum as SQLAlchemyEnum, Index
+from sqlmodel import SQLModel, Field
+
+
+
+def generate_outbound_email_id() -> str:
+    """Generate an ID like email_xxxxxxxx."""
+
+    return f"email_{uuid.uuid4().hex}"
+
+
+class OutboundEmailType(str, Enum):
+    """Outbound email type."""
+
+    WELCOME = "WELCOME"
+    OTP = "OTP"
+    PASSWORD = "PASSWORD"
+
+
+class OutboundEmailStatus(str, Enum):
+    """Outbound email status."""
+
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+class OutboundEmail(SQLModel, table = True):
+    """Outbound email model."""
+
+    __tablename__ = "outbound_emails"
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: str = Field(
+        default_factory = generate_outbound_email_id,
+        min_length = 38,
+        max_length = 38,
+        sa_column = Column(String(38), primary_key = True)
+    )
+    type: OutboundEmailType = Field(
+        sa_column = Column(SQLAlchemyEnum(OutboundEmailType, name = "outbound_email_type"), nullable = False)
+    )
+    recipient: str = Field(
+        sa_column = Column(String(255), nullable = False)
+    )
+    payload: Optional[Dict[str, Any]] = Field(
+        default = None,
+        sa_column = Column(JSON, nullable = True)
+    )
+    status: OutboundEmailStatus = Field(
+        default = OutboundEmailStatus.PENDING,
+        sa_column = Column(SQLAlchemyEnum(OutboundEmailStatus, name = "outbound_email_status"), nullable = False)
+    )
+    attempts: int = Field(
+        default = 0,
+        sa_column = Column(Integer, nullable = False)
+    )
+    last_error: Optional[str] = Field(
+        default = None,
+        sa_column = Column(String(1024), nullable = True)
+    )
+    next_attempt_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc),
+        sa_column = Column(DateTime(timezone = True), nullable = False)
+    )
+    created_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc),
+        sa_column = Column(
+            DateTime(timezone = True),
+            server_default = func.now(), # pylint: disable = E1102
+            nullable = False
+        )
+    )
+    updated_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc),
+        sa_column = Column(
+            DateTime(timezone = True),
+            server_default = func.now(), # pylint: disable = E1102
+            onupdate = func.now(), # pylint: disable = E1102
+            nullable = False
+        )
+    )
@@ -33,7 +33,7 @@ class Session(SQLModel, table = True):
         sa_column = Column(String(512), index = True, unique = True, nullable = False)
     )
     expires_at: datetime = Field(
-        sa_column = Column(DateTime(timezone = True), nullable = False)
+        sa_column = Column(DateTime(timezone = True), index = True, nullable = False)
     )
     created_at: datetime = Field(
         default_factory = lambda: datetime.now(timezone.utc),
@@ -0,0 +1,72 @@
+"""Stripe event database schema."""
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Column, DateTime, func, Integer, JSON, String, Enum as SQLAlchemyEnum, Index
+from sqlmodel import SQLModel, Field
+
+
+
+class StripeEventStatus(str, Enum):
+    """Stripe event status."""
+
+    PENDING = "PENDING"
+    PROCESSED = "PROCESSED"
+    IGNORED = "IGNORED"
+    FAILED = "FAILED"
+
+
+class StripeEvent(SQLModel, table = True):
+    """Stripe event model, keyed by the Stripe event id."""
+
+    __tablename__ = "stripe_events"
+    __table_args__ = (
+        Index("ix_stripe_events_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: str = Field(
+        max_length = 255,
+        sa_column = Column(String(255), primary_key = True)
+    )
+    type: str = Field(
+        sa_column = Column(String(255), nullable = False)
+    )
+    payload: Optional[Dict[str, Any]] = Field(
+        default = None,
+        sa_column = Column(JSON, nullable = True)
+    )
+    status: StripeEventStatus = Field(
+        default = StripeEventStatus.PENDING,
+        sa_column = Column(SQLAlchemyEnum(StripeEventStatus, name = "stripe_event_status"), nullable = False)
+    )
+    attempts: int = Field(
+        default = 0,
+        sa_column = Column(Integer, nullable = False)
+    )
+    last_error: Optional[str] = Field(
+        default = None,
+        sa_column = Column(String(1024), nullable = True)
+    )
+    next_attempt_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc),
+        sa_column = Column(DateTime(timezone = True), nullable = False)
+    )
+    created_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc),
+        sa_column = Column(
+            DateTime(timezone = True),
+            server_default = func.now(), # pylint: disable = E1102
+            nullable = False
+        )
+    )
+    updated_at: datetime = Field(
+        default_factory = lambda: datetime.now(timezone.utc),
+        sa_column = Column(
+            DateTime(timezone = True),
+            server_default = func.now(), # pylint: disable = E1102
+            onupdate = func.now(), # pylint: disable = E1102
+            nullable = False
+        )
+    )
@@ -5,7 +5,7 @@ from enum import Enum
 from typing import Optional
 import uuid
 
-from sqlalchemy import Column, DateTime, func, String, Float, Enum as SQLAlchemyEnum, ForeignKey
+from sqlalchemy import Column, DateTime, func, String, Float, Enum as SQLAlchemyEnum, ForeignKey, Index
 from sqlmodel import SQLModel, Field
 
 
@@ -27,6 +27,9 @@ class Transaction(SQLModel, table = True):
     """Transaction model."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: str = Field(
         default_factory = generate_transaction_id,
@@ -41,11 +41,12 @@ class User(SQLModel, table = True):
         unique = True,
         nullable = False)
     )
-    stripe_customer_id: str = Field(
+    stripe_customer_id: Optional[str] = Field(
+        default = None,
         sa_column = Column(String(255),
         index = True,
         unique = True,
-        nullable = False)
+        nullable = True)
     )
     google_user_id: Optional[str] = Field(
         sa_column = Column(String(255),
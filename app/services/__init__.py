@@ -1,11 +1,16 @@
 """Services package."""
 
 from app.services.authentication_service import Authentication
+from app.services.customer_provisioner_service import CustomerProvisioner
 from app.services.database_service import Database
 from app.services.email_service import Email
+from app.services.email_queue_service import EmailQueue
+from app.services.expiry_sweeper_service import ExpirySweeper
 from app.services.otp_service import OTP
+from app.services.password_service import Password
 from app.services.session_service import Session
 from app.services.stripe_service import Stripe
+from app.services.stripe_event_service import StripeEvents
 from app.services.transaction_service import Transaction
 from app.services.user_service import User
 
@@ -13,11 +18,16 @@ from app.services.user_service import User
 
 __all__ = [
     "Authentication",
+    "CustomerProvisioner",
     "Database",
     "Email",
+    "EmailQueue",
+    "ExpirySweeper",
     "OTP",
+    "Password",
     "Session",
     "Stripe",
+    "StripeEvents",
     "Transaction",
     "User",
 ]
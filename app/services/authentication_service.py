@@ -6,14 +6,15 @@ import os
 import time
 from typing import Callable, List
 
-import bcrypt
 from flask import request, Response as FlaskResponse
 import jwt
 from jwt.exceptions import DecodeError
 
 import app.data
-from app.schemas import User as UserModel, Session as SessionModel
+from app.schemas import User as UserModel
 from app.utils.api_responses import APIResponse
+from app.utils.token_cache import TokenCache
+from app.utils.token_revocation import TokenRevocations
 
 
 
@@ -21,22 +22,44 @@ class Authentication:
     """Authentication service functions."""
 
     def __init__(self) -> None:
-        pass
+        self.token_cache = TokenCache(
+            int(os.getenv("AUTH_CACHE_SIZE", "10000")),
+            float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+        )
+        self.token_revocations = None
+
+        # Other workers learn about logouts through LISTEN/NOTIFY, without it the cache stays off.
+        if self.token_cache.max_size > 0 and app.data.engine.dialect.driver == "psycopg2":
+            self.token_revocations = TokenRevocations(app.data.engine, self.token_cache)
 
     def validate_jwt(self, token: str) -> UserModel:
         """Validate a JWT token."""
-        
-        payload = jwt.decode(token, os.getenv("JWT_SECRET_KEY"), [os.getenv("JWT_ALGORITHM")])
 
-        if payload["role"] == os.getenv("USER_ROLE"):
+        cached = self.token_cache.get("crazi_couser_" + token)
 
-            token = "crazi_couser_" + token
-            session = app.data.ServiceConfig.session.view(token, SessionModel.token)
+        if cached is not None:
+
+            session, user = cached
 
             if time.time() > session.expires_at.timestamp():
+
+                self.token_cache.invalidate_token(session.token)
                 raise ValueError
+
+            return user
         
-        return app.data.ServiceConfig.user.view(session.user_id, UserModel.id)
+        payload = jwt.decode(token, os.getenv("JWT_SECRET_KEY"), [os.getenv("JWT_ALGORITHM")])
+
+        if payload["role"] != os.getenv("USER_ROLE"):
+            raise ValueError
+
+        token = "crazi_couser_" + token
+        generation = self.token_cache.generation
+        session, user = app.data.ServiceConfig.session.view_with_user(token)
+
+        self.token_cache.set(token, session, user, generation)
+
+        return user
     
     def general_authentication_inactive(self, route: Callable) -> Callable:
         """General authentication decorator for user and private authentication."""
@@ -195,9 +218,12 @@ class Authentication:
 
                 user = app.data.ServiceConfig.user.view(credentials[0], UserModel.email)
 
-                if not bcrypt.checkpw(credentials[1].encode("utf8"), user.password.encode("utf8")):
+                if not app.data.ServiceConfig.password.check(credentials[1], user.password):
                     raise ValueError
 
+                if app.data.ServiceConfig.password.needs_rehash(user.password):
+                    user = app.data.ServiceConfig.user.update(user.id, UserModel.id, password = app.data.ServiceConfig.password.hash(credentials[1]))
+
                 token = app.data.ServiceConfig.session.create(user.id).token
 
                 kwargs["user"] = user
@@ -0,0 +1,170 @@
+"""Service for stripe customer provisioning operations."""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlmodel import select, Session as SQLModelSession
+
+import app.data
+from app.error_handing import StripeError
+from app.schemas import User as UserModel
+from app.utils.logging_config import get_logger
+
+
+
+logger = get_logger("customer_provisioner")
+
+
+class CustomerProvisioner:
+    """Customer provisioner service functions."""
+
+    def __init__(self) -> None:
+        self.lazy = os.getenv("STRIPE_CUSTOMER_PROVISIONING", "eager").lower() == "lazy"
+        self.batch_size = int(os.getenv("STRIPE_CUSTOMER_BATCH_SIZE", "20"))
+        self.poll_interval = float(os.getenv("STRIPE_CUSTOMER_POLL_SECONDS", "30"))
+        self.backoff = float(os.getenv("STRIPE_CUSTOMER_BACKOFF_SECONDS", "60"))
+        self.max_backoff = float(os.getenv("STRIPE_CUSTOMER_MAX_BACKOFF_SECONDS", "3600"))
+        self.failures: Dict[str, Tuple[int, float]] = {}
+        self.wakeup = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+
+    def provision(self, user_id: str, skip_locked: bool = False) -> Optional[str]:
+        """Create the Stripe customer of a user if it is missing and return its id.
+
+        The user row stays locked while Stripe is called, so concurrent callers
+        wait for the first one instead of creating duplicate customers.
+        """
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            statement = select(UserModel).where(UserModel.id == user_id).with_for_update(skip_locked = skip_locked)
+            user = session.exec(statement).first()
+
+            if user is None:
+                return None
+
+            if user.stripe_customer_id:
+                return user.stripe_customer_id
+
+            customer = app.data.ServiceConfig.stripe.create_customer(user.first_name, user.last_name, user.email, user_id = user.id)
+
+            user.stripe_customer_id = customer.id
+
+            session.add(user)
+
+            if app.data.ServiceConfig.authentication:
+                app.data.ServiceConfig.authentication.token_cache.invalidate_user(user_id, session)
+
+            session.commit()
+
+        return customer.id
+
+    def customer_id(self, user: UserModel) -> str:
+        """Return the Stripe customer of a user, creating it on first use."""
+
+        if user.stripe_customer_id:
+            return user.stripe_customer_id
+
+        customer_id = self.provision(user.id)
+
+        if customer_id is None:
+            raise ValueError
+
+        return customer_id
+
+    def backfill(self) -> Dict[str, int]:
+        """Provision every user that still has no Stripe customer, once."""
+
+        totals = {"provisioned": 0, "failed": 0}
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            statement = select(UserModel.id).where(UserModel.stripe_customer_id.is_(None)).order_by(UserModel.created_at)
+            user_ids = session.execute(statement).scalars().all()
+
+        for user_id in user_ids:
+
+            try:
+
+                self.provision(user_id)
+                totals["provisioned"] += 1
+
+            except StripeError as exc:
+
+                logger.error("Stripe customer backfill failed for user %s: %s", user_id, exc)
+                totals["failed"] += 1
+
+        return totals
+
+    def reconcile(self) -> int:
+        """Provision one batch of users without a Stripe customer and return how many were provisioned.
+
+        Users whose provisioning failed are retried with exponential backoff and left
+        out of the batch until then, so they cannot starve the users behind them.
+        """
+
+        now = time.monotonic()
+        backing_off = [user_id for user_id, (_, retry_at) in self.failures.items() if retry_at > now]
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            statement = (
+                select(UserModel.id)
+                .where(UserModel.stripe_customer_id.is_(None))
+                .where(UserModel.id.not_in(backing_off))
+                .order_by(UserModel.created_at)
+                .limit(self.batch_size)
+            )
+            user_ids = session.execute(statement).scalars().all()
+
+        provisioned = 0
+
+        for user_id in user_ids:
+
+            try:
+
+                if self.provision(user_id, skip_locked = True):
+                    provisioned += 1
+
+                self.failures.pop(user_id, None)
+
+            except StripeError as exc:
+
+                attempts = self.failures.get(user_id, (0, 0.0))[0] + 1
+                delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+
+                self.failures[user_id] = (attempts, time.monotonic() + delay)
+
+                logger.error("Stripe customer provisioning failed for user %s (attempt %s, retrying in %ss): %s", user_id, attempts, delay, exc)
+
+        return provisioned
+
+    def run(self) -> None:
+        """Reconcile missing customers until the process exits."""
+
+        while True:
+
+            try:
+                processed = self.reconcile()
+
+            except Exception as exc: # pylint: disable = W0718
+
+                logger.error("Stripe customer reconciliation failed: %s", exc)
+                processed = 0
+
+            # Only a fully provisioned batch goes straight on, anything less waits for the next poll.
+            if processed < self.batch_size:
+
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+
+    def start_worker(self) -> None:
+        """Start the background provisioning thread for this process."""
+
+        if self.worker is not None and self.worker.is_alive():
+            return
+
+        self.worker = threading.Thread(target = self.run, name = "customer-provisioner", daemon = True)
+        self.worker.start()
@@ -1,11 +1,14 @@
 """Service for database operations."""
 
 import os
-from typing import Optional, List
+from typing import Any, Callable, Dict, Iterator, Optional, List, Sequence, Union
 from sqlmodel import create_engine, select, SQLModel, Session as SQLModelSession
-from sqlalchemy import inspect
+from sqlalchemy import bindparam, inspect, Row
 
 import app.data
+from app.utils.database_pool import dispose_after_fork, instrument_pool, pool_options, pool_statistics
+from app.utils.query_instrumentation import instrument_queries, query_histogram
+from app.utils.query_registry import instrument_compiled_cache, query_registry
 
 
 
@@ -20,17 +23,56 @@ class Database:
         """Initialize the database."""
         
         if not app.data.engine:
-            app.data.engine = create_engine(os.getenv("DATABASE_DSN"), echo = True)
+
+            query_cache_size = int(os.getenv("DATABASE_QUERY_CACHE_SIZE", "1200"))
+
+            app.data.engine = create_engine(
+                os.getenv("DATABASE_DSN"),
+                echo = os.getenv("DATABASE_ECHO", "false").lower() == "true",
+                query_cache_size = query_cache_size,
+                **pool_options()
+            )
+
+            instrument_pool(app.data.engine)
+            instrument_queries(app.data.engine)
+            instrument_compiled_cache(app.data.engine, query_cache_size)
+
+            # Gunicorn workers must not share the parent's pooled sockets.
+            os.register_at_fork(after_in_child = lambda: dispose_after_fork(app.data.engine))
 
         if app.data.table_creation_required:
 
             existing_tables = inspect(app.data.engine).get_table_names()
 
-            if not existing_tables:
+            if set(SQLModel.metadata.tables) - set(existing_tables):
                 SQLModel.metadata.create_all(app.data.engine)
 
             app.data.table_creation_required = False
 
+    @staticmethod
+    def pool_statistics() -> Dict[str, Any]:
+        """View the connection pool statistics of this worker."""
+
+        return pool_statistics.snapshot(app.data.engine)
+
+    @staticmethod
+    def query_statistics() -> Dict[str, Any]:
+        """View the statement timing histogram of this worker."""
+
+        return query_histogram.snapshot()
+
+    @staticmethod
+    def query_cache_statistics() -> Dict[str, Any]:
+        """View the statement registry and compiled cache counters of this worker."""
+
+        return query_registry.snapshot()
+
+    @staticmethod
+    def statement(key: Any, builder: Callable[[], Any]) -> Any:
+        """Get a hot statement built once with bind parameters."""
+
+        return query_registry.get(key, builder)
+
     def insert(self, model: SQLModel) -> SQLModel:
         """Insert a model into the database."""
 
@@ -48,36 +90,78 @@ class Database:
         if column is None:
             column = self.table.id
 
+        statement = self.statement(
+            ("view", self.table.__name__, column.key),
+            lambda: select(self.table).where(column == bindparam("value"))
+        )
+
         with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
 
-            statement = select(self.table).where(column == value)
-            result = session.exec(statement).first()
+            result = session.exec(statement, params = {"value": value}).first()
 
             return result
 
-    def view_all(self, limit: int = 100, offset: int = 0) -> List[SQLModel]:
+    def select(self, columns: Optional[Sequence[Any]] = None) -> Any:
+        """Select whole models, or only the given columns as lightweight rows."""
+
+        if columns:
+            return select(*columns)
+
+        return select(self.table)
+
+    @staticmethod
+    def fetch_all(session: SQLModelSession, statement: Any, columns: Optional[Sequence[Any]] = None) -> List[Union[SQLModel, Row]]:
+        """Fetch all results of a statement built with select."""
+
+        if columns:
+            return session.execute(statement).all()
+
+        return session.exec(statement).all()
+
+    def view_all(self, limit: int = 100, offset: int = 0, columns: Optional[Sequence[Any]] = None) -> List[Union[SQLModel, Row]]:
         """View all models from the database."""
 
         with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
 
-            statement = select(self.table).offset(offset).limit(limit)
-            results = session.exec(statement).all()
+            statement = self.select(columns).offset(offset).limit(limit)
+            results = self.fetch_all(session, statement, columns)
             return results
 
-    def update(self, model: SQLModel) -> SQLModel:
-        """Update a model from the database."""
+    def stream_all(self, batch_size: int = 1000, columns: Optional[Sequence[Any]] = None) -> Iterator[Union[SQLModel, Row]]:
+        """Stream all models from the database through a server-side cursor."""
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            statement = self.select(columns).order_by(self.table.id).execution_options(yield_per = batch_size)
+
+            if columns:
+                yield from session.execute(statement)
+
+            else:
+                yield from session.exec(statement)
+
+    def update(self, model: SQLModel, before_commit: Optional[Callable[[SQLModelSession], None]] = None) -> SQLModel:
+        """Update a model from the database, running before_commit inside the same transaction."""
 
         with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
 
             session.merge(model)
+
+            if before_commit is not None:
+                before_commit(session)
+
             session.commit()
 
             return model
 
-    def delete(self, model: SQLModel) -> None:
-        """Delete a model from the database."""
+    def delete(self, model: SQLModel, before_commit: Optional[Callable[[SQLModelSession], None]] = None) -> None:
+        """Delete a model from the database, running before_commit inside the same transaction."""
 
         with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
 
             session.delete(model)
+
+            if before_commit is not None:
+                before_commit(session)
+
             session.commit()
@@ -0,0 +1,141 @@
+"""Service for outbound email queue operations."""
+
+from datetime import datetime, timedelta, timezone
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy import func
+from sqlmodel import select, Session as SQLModelSession
+
+import app.data
+from app.error_handing import AWSError
+from app.schemas import OutboundEmail as OutboundEmailModel
+from app.schemas.database.outbound_email import OutboundEmailStatus, OutboundEmailType
+from app.services import Database
+from app.utils.logging_config import get_logger
+
+
+
+logger = get_logger("email_queue")
+
+
+class EmailQueue:
+    """Email queue service functions."""
+
+    def __init__(self) -> None:
+        self.database_service = Database(OutboundEmailModel)
+        self.batch_size = int(os.getenv("EMAIL_QUEUE_BATCH_SIZE", "20"))
+        self.max_attempts = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "5"))
+        self.backoff = float(os.getenv("EMAIL_QUEUE_BACKOFF_SECONDS", "30"))
+        self.poll_interval = float(os.getenv("EMAIL_QUEUE_POLL_SECONDS", "5"))
+        self.wakeup = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+
+    def enqueue(self, email_type: OutboundEmailType, to: str, **payload) -> OutboundEmailModel:
+        """Queue an email for delivery."""
+
+        email = OutboundEmailModel.model_validate({
+            "type": email_type,
+            "recipient": to,
+            "payload": payload,
+        })
+
+        email = self.database_service.insert(email)
+
+        self.wakeup.set()
+
+        return email
+
+    def send(self, email: OutboundEmailModel) -> None:
+        """Send a queued email through the email service."""
+
+        if email.type == OutboundEmailType.WELCOME:
+            app.data.ServiceConfig.email.welcome(email.recipient, **email.payload)
+
+        elif email.type == OutboundEmailType.OTP:
+            app.data.ServiceConfig.email.otp(email.recipient, **email.payload)
+
+        elif email.type == OutboundEmailType.PASSWORD:
+            app.data.ServiceConfig.email.password(email.recipient, **email.payload)
+
+    def drain(self) -> int:
+        """Send one batch of due emails and return how many were processed."""
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            statement = (
+                select(OutboundEmailModel)
+                .where(OutboundEmailModel.status == OutboundEmailStatus.PENDING)
+                .where(OutboundEmailModel.next_attempt_at <= func.now()) # pylint: disable = E1102
+                .order_by(OutboundEmailModel.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked = True)
+            )
+            emails = session.exec(statement).all()
+
+            for email in emails:
+
+                email.attempts += 1
+
+                try:
+
+                    self.send(email)
+
+                    email.status = OutboundEmailStatus.SENT
+                    email.last_error = None
+
+                except AWSError as exc:
+
+                    email.last_error = str(exc.context.get("message", ""))[:1024]
+
+                    if email.attempts >= self.max_attempts:
+                        email.status = OutboundEmailStatus.FAILED
+
+                    else:
+                        email.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds = self.backoff * 2 ** (email.attempts - 1))
+
+                except Exception as exc: # pylint: disable = W0718
+
+                    # Anything but a transport error, e.g. a payload the template no longer accepts, will not heal on retry.
+                    logger.error("Email %s could not be sent: %s", email.id, exc)
+
+                    email.last_error = str(exc)[:1024]
+                    email.status = OutboundEmailStatus.FAILED
+
+                # Payloads can hold one-time secrets, drop them once they are no longer needed.
+                if email.status != OutboundEmailStatus.PENDING:
+                    email.payload = None
+
+                session.add(email)
+
+            session.commit()
+
+        return len(emails)
+
+    def run(self) -> None:
+        """Drain the queue until the process exits."""
+
+        while True:
+
+            try:
+                processed = self.drain()
+
+            except Exception as exc: # pylint: disable = W0718
+
+                logger.error("Email queue drain failed: %s", exc)
+                processed = 0
+
+            if processed < self.batch_size:
+
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+
+    def start_worker(self) -> None:
+        """Start the background delivery thread for this process."""
+
+        if self.worker is not None and self.worker.is_alive():
+            return
+
+        self.worker = threading.Thread(target = self.run, name = "email-queue", daemon = True)
+        self.worker.start()
@@ -1,10 +1,15 @@
 """Service for email operations."""
 
+import json
 import os
+from typing import Any, Dict, List, Optional, Tuple
+
 import boto3
 from botocore.exceptions import ClientError, BotoCoreError, ParamValidationError
 
 from app.error_handing import AWSError
+from app.utils.email_templates import EmailTemplate, EmailTemplates
+from app.utils.email_transport import StubSESClient
 
 
 
@@ -12,6 +17,7 @@ class Email:
     """Email service functions."""
 
     source = "Crazi Co <noreply@crazi.co>"
+    bulk_batch_size = 50
     
     welcome_subject = "Welcome to Crazi Co!"
     welcome_text = "Welcome to Crazi Co. To finish setting up your account, confirm your email address by clicking the following link - <url>.\n\nThis code will expire in 10 minutes for your security. If you didn't request this email, there's nothing to worry about, you can safely ignore it."
@@ -23,23 +29,37 @@ class Email:
     password_text = "Welcome to Crazi Co. Here's your auto-generated password, use it to login to your account - <password>.\n\n For security, please change this password after your first login. If you didn't request this account creation, please write to us at support@crazi.co."
 
     def __init__(self) -> None:
-        self.client = boto3.client(
-            "ses",
-            region_name = os.getenv("SES_AWS_REGION"),
-            aws_access_key_id = os.getenv("SES_AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key = os.getenv("SES_AWS_SECRET_ACCESS_KEY")
+
+        self.templates = EmailTemplates(
+            os.path.join("app", "data", "email_templates"),
+            reload = os.getenv("ENVIRONMENT") == "development"
         )
 
+        self.welcome_text_template = EmailTemplate(self.welcome_text, EmailTemplates.slots)
+        self.otp_text_template = EmailTemplate(self.otp_text, EmailTemplates.slots)
+        self.password_text_template = EmailTemplate(self.password_text, EmailTemplates.slots)
+
+        if os.getenv("EMAIL_TRANSPORT", "ses") == "stub":
+            self.client = StubSESClient()
+
+        else:
+
+            self.client = boto3.client(
+                "ses",
+                region_name = os.getenv("SES_AWS_REGION"),
+                aws_access_key_id = os.getenv("SES_AWS_ACCESS_KEY_ID"),
+                aws_secret_access_key = os.getenv("SES_AWS_SECRET_ACCESS_KEY")
+            )
+
     def welcome(self, to: str, code: str, user_id: str, user_token: str) -> None:
         """Send a welcome email to the user."""
 
         try:
 
-            with open(os.path.join("app", "data", "email_templates", "welcome_email.html"), "r", encoding = "utf-8") as file:
-                html = file.read()
+            url = f"{os.getenv('CLIENT_URL')}/auth/email/activate?email={to}&code={code}&user_id={user_id}&user_token={user_token}"
 
-            html = html.replace("<url>", f"{os.getenv('CLIENT_URL')}/auth/email/activate?email={to}&code={code}&user_id={user_id}&user_token={user_token}").replace("<code>", code)
-            text = self.welcome_text.replace("<url>", f"{os.getenv('CLIENT_URL')}/auth/email/activate?email={to}&code={code}&user_id={user_id}&user_token={user_token}").replace("<code>", code)
+            html = self.templates.get("welcome_email.html").render(url = url, code = code)
+            text = self.welcome_text_template.render(url = url, code = code)
 
             response = self.client.send_email(
                 Source = self.source,
@@ -116,11 +136,8 @@ class Email:
 
         try:
 
-            with open(os.path.join("app", "data", "email_templates", "otp_email.html"), "r", encoding = "utf-8") as file:
-                html = file.read()
-
-            html = html.replace("<code>", code)
-            text = self.otp_text.replace("<code>", code)
+            html = self.templates.get("otp_email.html").render(code = code)
+            text = self.otp_text_template.render(code = code)
             
             response = self.client.send_email(
                 Source = self.source,
@@ -196,11 +213,8 @@ class Email:
 
         try:
 
-            with open(os.path.join("app", "data", "email_templates", "password_email.html"), "r", encoding = "utf-8") as file:
-                html = file.read()
-
-            html = html.replace("<password>", password)
-            text = self.password_text.replace("<password>", password)
+            html = self.templates.get("password_email.html").render(password = password)
+            text = self.password_text_template.render(password = password)
             
             response = self.client.send_email(
                 Source = self.source,
@@ -270,3 +284,71 @@ class Email:
                 metadata = {"email_type": "welcome"},
                 original_error = exc
             ) from exc
+
+    def bulk_send(self, template: str, recipients: List[Tuple[str, Dict[str, Any]]], default_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Send an SES template to many recipients, 50 destinations per call.
+
+        Raises AWSError listing the failed recipients, with every per-recipient result on its results attribute.
+        """
+
+        results: List[Dict[str, Any]] = []
+
+        for start in range(0, len(recipients), self.bulk_batch_size):
+
+            batch = recipients[start:start + self.bulk_batch_size]
+
+            try:
+
+                response = self.client.send_bulk_templated_email(
+                    Source = self.source,
+                    Template = template,
+                    DefaultTemplateData = json.dumps(default_data or {}),
+                    Destinations = [
+                        {
+                            "Destination": {"ToAddresses": [to],},
+                            "ReplacementTemplateData": json.dumps(data),
+                        }
+                        for to, data in batch
+                    ]
+                )
+
+                for (to, _), status in zip(batch, response["Status"]):
+
+                    results.append({
+                        "recipient": to,
+                        "status": status.get("Status"),
+                        "error": status.get("Error", None),
+                        "message_id": status.get("MessageId", None),
+                    })
+
+            except ClientError as exc:
+
+                error_code = exc.response.get('Error', {}).get('Code', 'Unknown')
+                error_message = exc.response.get('Error', {}).get('Message', str(exc))
+
+                results.extend({"recipient": to, "status": error_code, "error": error_message, "message_id": None} for to, _ in batch)
+
+            except (BotoCoreError, ParamValidationError) as exc:
+                results.extend({"recipient": to, "status": type(exc).__name__, "error": str(exc), "message_id": None} for to, _ in batch)
+
+        failures = [result for result in results if result["status"] != "Success"]
+
+        if failures:
+
+            # Only the failures go into the logged context, the full results can be large.
+            error = AWSError(
+                f"SES bulk send failed for {len(failures)} of {len(results)} recipients",
+                service_name = "ses",
+                operation = "send_bulk_templated_email",
+                error_type = "partial_failure" if len(failures) < len(results) else "bulk_failure",
+                metadata = {
+                    "email_type": "bulk",
+                    "template": template,
+                    "failures": failures,
+                }
+            )
+            error.results = results
+
+            raise error
+
+        return results
@@ -0,0 +1,120 @@
+"""Service for expired row sweeping operations."""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, text
+from sqlmodel import select, Session as SQLModelSession, SQLModel
+
+import app.data
+from app.schemas import OTP as OTPModel, Session as SessionModel
+from app.utils.logging_config import get_logger
+
+
+
+logger = get_logger("expiry_sweeper")
+
+
+class ExpirySweeper:
+    """Expiry sweeper service functions."""
+
+    # Arbitrary application wide key, only one worker sweeps at a time.
+    advisory_lock_key = 0x73776565
+
+    def __init__(self) -> None:
+        self.tables = (SessionModel, OTPModel)
+        self.batch_size = int(os.getenv("EXPIRY_SWEEP_BATCH_SIZE", "1000"))
+        self.max_batches = int(os.getenv("EXPIRY_SWEEP_MAX_BATCHES", "100"))
+        self.interval = float(os.getenv("EXPIRY_SWEEP_INTERVAL_SECONDS", "300"))
+        self.stopped = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+
+    def _acquire_leadership(self, session: SQLModelSession) -> bool:
+
+        if app.data.engine.dialect.name != "postgresql":
+            return True
+
+        return session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": self.advisory_lock_key}).scalar()
+
+    def sweep_batch(self, table: SQLModel) -> Optional[int]:
+        """Delete one batch of expired rows, or return None when another worker holds the lock."""
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            if not self._acquire_leadership(session):
+                return None
+
+            expired = (
+                select(table.id)
+                .where(table.expires_at <= func.now()) # pylint: disable = E1102
+                .limit(self.batch_size)
+                .with_for_update(skip_locked = True)
+            )
+            deleted = session.execute(delete(table).where(table.id.in_(expired))).rowcount
+            session.commit()
+
+        return deleted
+
+    def sweep(self) -> Dict[str, int]:
+        """Delete expired rows from every swept table in bounded batches."""
+
+        totals = {}
+
+        for table in self.tables:
+
+            totals[table.__tablename__] = 0
+
+            for _ in range(self.max_batches):
+
+                deleted = self.sweep_batch(table)
+
+                if deleted is None:
+                    return totals
+
+                totals[table.__tablename__] += deleted
+
+                if deleted < self.batch_size:
+                    break
+
+        return totals
+
+    def run(self) -> None:
+        """Sweep now and then on an interval until stopped."""
+
+        # The application logs at ERROR, sweep summaries must still get through.
+        logger.setLevel(logging.INFO)
+
+        while True:
+
+            try:
+
+                totals = self.sweep()
+
+                if any(totals.values()):
+                    logger.info("Expired rows swept: %s", totals)
+
+            except Exception as exc: # pylint: disable = W0718
+                logger.error("Expiry sweep failed: %s", exc)
+
+            if self.stopped.wait(self.interval):
+                return
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background sweeping thread, waiting for a sweep in progress."""
+
+        self.stopped.set()
+
+        if self.worker is not None and self.worker is not threading.current_thread():
+            self.worker.join(timeout)
+
+    def start_worker(self) -> None:
+        """Start the background sweeping thread for this process."""
+
+        if self.worker is not None and self.worker.is_alive():
+            return
+
+        self.stopped.clear()
+        self.worker = threading.Thread(target = self.run, name = "expiry-sweeper", daemon = True)
+        self.worker.start()
@@ -1,5 +1,8 @@
 """Service for otp operations."""
 
+from typing import Optional
+
+from sqlalchemy import bindparam
 from sqlmodel import select, Session
 
 import app.data
@@ -15,6 +18,17 @@ class OTP:
     def __init__(self) -> None:
         self.database_service = Database(OTPModel)
 
+    @staticmethod
+    def _find(user_id: str, otp_type: OTPType) -> Optional[OTPModel]:
+
+        statement = Database.statement(
+            "otp.by_user_and_type",
+            lambda: select(OTPModel).where(OTPModel.user_id == bindparam("user_id")).where(OTPModel.type == bindparam("type"))
+        )
+
+        with Session(app.data.engine) as session:  # pylint: disable=E1129
+            return session.exec(statement, params = {"user_id": user_id, "type": otp_type}).first()
+
     def create(
         self,
         user_id: str,
@@ -22,10 +36,7 @@ class OTP:
     ) -> OTPModel:
         """Create a otp."""
         
-        with Session(app.data.engine) as session:  # pylint: disable=E1129
-
-            statement = select(OTPModel).where(OTPModel.user_id == user_id).where(OTPModel.type == otp_type)
-            otp = session.exec(statement).first()
+        otp = self._find(user_id, otp_type)
 
         if otp is not None:
             self.database_service.delete(otp)
@@ -40,10 +51,7 @@ class OTP:
     def view(self, user_id: str, otp_type: OTPType) -> OTPModel:
         """View a otp."""
 
-        with Session(app.data.engine) as session:  # pylint: disable=E1129
-
-            statement = select(OTPModel).where(OTPModel.user_id == user_id).where(OTPModel.type == otp_type)
-            otp = session.exec(statement).first()
+        otp = self._find(user_id, otp_type)
 
         if otp is None:
             raise ValueError
@@ -53,10 +61,7 @@ class OTP:
     def delete(self, user_id: str, otp_type: OTPType) -> None:
         """Delete a otp."""
 
-        with Session(app.data.engine) as session:  # pylint: disable=E1129
-
-            statement = select(OTPModel).where(OTPModel.user_id == user_id).where(OTPModel.type == otp_type)
-            otp = session.exec(statement).first()
+        otp = self._find(user_id, otp_type)
 
         if otp is None:
             raise ValueError
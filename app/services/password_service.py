@@ -0,0 +1,101 @@
+"""Service for password hashing operations."""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+
+
+
+def hash_password(password: bytes, rounds: int) -> bytes:
+    """Hash a password with bcrypt."""
+
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+def check_password(password: bytes, hashed: bytes) -> bool:
+    """Check a password against a bcrypt hash."""
+
+    return bcrypt.checkpw(password, hashed)
+
+
+class Password:
+    """Password service functions."""
+
+    def __init__(self) -> None:
+        self.rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+        self.workers = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+        self.lock = threading.Lock()
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.executor_pid: Optional[int] = None
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.busy_seconds = 0.0
+
+    def _submit(self, function: Callable, *args) -> Any:
+
+        if self.workers <= 0:
+            return function(*args)
+
+        with self.lock:
+
+            # Forked workers must not reuse the parent's executor.
+            if self.executor is None or self.executor_pid != os.getpid():
+
+                self.executor = ProcessPoolExecutor(self.workers, mp_context = multiprocessing.get_context("spawn"))
+                self.executor_pid = os.getpid()
+
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+        start = time.perf_counter()
+        future: Future = self.executor.submit(function, *args)
+
+        try:
+            return future.result()
+
+        finally:
+
+            with self.lock:
+
+                self.pending -= 1
+                self.completed += 1
+                self.busy_seconds += time.perf_counter() - start
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor."""
+
+        return self._submit(hash_password, password.encode("utf-8"), self.rounds).decode("utf-8")
+
+    def check(self, password: str, hashed: str) -> bool:
+        """Check a password against its hash."""
+
+        return self._submit(check_password, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a hash was made with a different cost factor than the configured one."""
+
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+
+        except (IndexError, ValueError):
+            return True
+
+    def statistics(self) -> Dict[str, Any]:
+        """Return the hashing pool statistics of this worker."""
+
+        with self.lock:
+
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "in_flight": self.pending,
+                "queue_depth": max(0, self.pending - self.workers),
+                "max_in_flight": self.max_pending,
+                "completed": self.completed,
+                "average_ms": round(self.busy_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+            }
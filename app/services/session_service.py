@@ -2,13 +2,14 @@
 
 from datetime import datetime, timedelta, timezone
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 
+from sqlalchemy import bindparam, delete, func, Row
 from sqlmodel import select, Session as SQLModelSession
 import jwt
 
 import app.data
-from app.schemas import Session as SessionModel
+from app.schemas import Session as SessionModel, User as UserModel
 from app.services import Database
 
 
@@ -18,14 +19,11 @@ class Session:
 
     def __init__(self) -> None:
         self.database_service = Database(SessionModel)
+        self.max_sessions = int(os.getenv("MAX_SESSIONS_PER_USER", "20"))
 
-    def create(
-        self,
-        user_id: str
-    ) -> SessionModel:
-        """Create a session."""
-        
-        session = self.database_service.view(user_id, SessionModel.user_id)
+    @staticmethod
+    def build(user_id: str) -> SessionModel:
+        """Build a new session without storing it."""
 
         expiry = datetime.now(timezone.utc) + timedelta(days = int(os.getenv("SESSION_EXPIRY_IN_DAYS")))
 
@@ -42,28 +40,65 @@ class Session:
             algorithm = os.getenv("JWT_ALGORITHM")
         )
         
-        session = SessionModel.model_validate({
+        return SessionModel.model_validate({
             "user_id": user_id,
             "token": f"crazi_couser_{token}",
             "expires_at": expiry,
         })
 
-        return self.database_service.insert(session)
+    def create(
+        self,
+        user_id: str
+    ) -> SessionModel:
+        """Create a session, evicting the oldest ones above the per user cap."""
+
+        session = self.build(user_id)
+
+        if self.max_sessions <= 0:
+            return self.database_service.insert(session)
+
+        with SQLModelSession(app.data.engine) as db_session:  # pylint: disable=E1129
+
+            db_session.add(session)
+            db_session.flush()
+
+            newest = (
+                select(SessionModel.id)
+                .where(SessionModel.user_id == user_id)
+                .order_by(SessionModel.created_at.desc(), SessionModel.id.desc())
+                .limit(self.max_sessions)
+            )
+            statement = (
+                delete(SessionModel)
+                .where(SessionModel.user_id == user_id)
+                .where(SessionModel.id.not_in(newest))
+                .returning(SessionModel.token)
+            )
+            evicted = db_session.execute(statement).scalars().all()
+
+            for evicted_token in evicted:
+                app.data.ServiceConfig.authentication.token_cache.invalidate_token(evicted_token, db_session)
+
+            db_session.commit()
+            db_session.refresh(session)
+
+        return session
 
     def view_all(
         self,
         user_id: str,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
-    ) -> List[SessionModel]:
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Union[SessionModel, Row]]:
         """View all sessions."""
 
         if not limit and not offset:
 
             with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
 
-                statement = select(SessionModel).where(SessionModel.user_id == user_id).offset(offset).limit(limit)
-                sessions = session.exec(statement).all()
+                statement = self.database_service.select(columns).where(SessionModel.user_id == user_id).offset(offset).limit(limit)
+                sessions = self.database_service.fetch_all(session, statement, columns)
                 
                 return sessions
 
@@ -74,8 +109,8 @@ class Session:
 
             with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
 
-                statement = select(SessionModel).where(SessionModel.user_id == user_id).offset(offset).limit(limit)
-                results = session.exec(statement).all()
+                statement = self.database_service.select(columns).where(SessionModel.user_id == user_id).offset(offset).limit(limit)
+                results = self.database_service.fetch_all(session, statement, columns)
 
             sessions.extend(results)
 
@@ -104,6 +139,46 @@ class Session:
         
         return session
     
+    def view_with_user(self, token: str) -> Tuple[SessionModel, UserModel]:
+        """View a live session and its user in a single query."""
+
+        statement = Database.statement(
+            "session.live_with_user",
+            lambda: (
+                select(SessionModel, UserModel)
+                .join(UserModel, UserModel.id == SessionModel.user_id)
+                .where(SessionModel.token == bindparam("token"))
+                .where(SessionModel.expires_at > func.now()) # pylint: disable = E1102
+            )
+        )
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+            result = session.exec(statement, params = {"token": token}).first()
+
+        if result is None:
+            raise ValueError
+
+        return result[0], result[1]
+
+    def revoke_all(self, user_id: str, except_token: Optional[str] = None) -> int:
+        """Revoke every session of a user in a single statement, optionally keeping one token."""
+
+        statement = delete(SessionModel).where(SessionModel.user_id == user_id)
+
+        if except_token:
+            statement = statement.where(SessionModel.token != except_token)
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            tokens = session.execute(statement.returning(SessionModel.token)).scalars().all()
+
+            for token in tokens:
+                app.data.ServiceConfig.authentication.token_cache.invalidate_token(token, session)
+
+            session.commit()
+
+        return len(tokens)
+
     def delete(self, value: str, column: str) -> None:
         """Delete a session."""
 
@@ -119,4 +194,7 @@ class Session:
         if session is None:
             raise ValueError
 
-        return self.database_service.delete(session)
+        self.database_service.delete(
+            session,
+            before_commit = lambda db_session: app.data.ServiceConfig.authentication.token_cache.invalidate_token(session.token, db_session)
+        )
@@ -0,0 +1,166 @@
+"""Service for stripe webhook event operations."""
+
+from datetime import datetime, timedelta, timezone
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import select, Session as SQLModelSession
+from stripe import Event
+
+import app.data
+from app.schemas import StripeEvent as StripeEventModel, User as UserModel
+from app.schemas.database.stripe_event import StripeEventStatus
+from app.schemas.database.transaction import TransactionType
+from app.utils.logging_config import get_logger
+
+
+
+logger = get_logger("stripe_events")
+
+
+class StripeEvents:
+    """Stripe event service functions."""
+
+    def __init__(self) -> None:
+        self.batch_size = int(os.getenv("STRIPE_EVENT_BATCH_SIZE", "20"))
+        self.max_attempts = int(os.getenv("STRIPE_EVENT_MAX_ATTEMPTS", "5"))
+        self.backoff = float(os.getenv("STRIPE_EVENT_BACKOFF_SECONDS", "30"))
+        self.poll_interval = float(os.getenv("STRIPE_EVENT_POLL_SECONDS", "5"))
+        self.wakeup = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+
+    @staticmethod
+    def payload(event: Event) -> Dict[str, Any]:
+        """Keep only the parts of a checkout event that settling needs."""
+
+        # Stripe objects are not mappings, to_dict gives plain JSON for the event log.
+        checkout_session = event.data.object.to_dict()
+
+        return {
+            "payment_intent": checkout_session["payment_intent"],
+            "metadata": checkout_session["metadata"],
+        }
+
+    def record(self, event: Event) -> bool:
+        """Store a verified event once and return whether it was new."""
+
+        stripe_event = StripeEventModel.model_validate({
+            "id": event.id,
+            "type": event.type,
+            "payload": self.payload(event),
+        })
+
+        statement = insert(StripeEventModel).values(**stripe_event.model_dump()).on_conflict_do_nothing(index_elements = ["id"])
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            created = session.execute(statement).rowcount > 0
+            session.commit()
+
+        if created:
+            self.wakeup.set()
+
+        return created
+
+    @staticmethod
+    def settle(session: SQLModelSession, stripe_event: StripeEventModel) -> str:
+        """Credit a checkout payment inside the caller's transaction and return the user id."""
+
+        metadata = stripe_event.payload["metadata"]
+
+        value_in_fiat = float(metadata["value_in_fiat"])
+        value_in_credits = float(metadata["value_in_credits"])
+
+        transaction = app.data.ServiceConfig.user.apply_credits(
+            session,
+            metadata["user_id"],
+            UserModel.id,
+            value_in_credits,
+            payment_intent = stripe_event.payload["payment_intent"],
+            transaction_description = f"User bought {value_in_credits} credits for ${value_in_fiat}.",
+            transaction_type = TransactionType.CREDIT
+        )
+
+        return transaction.user_id
+
+    def drain(self) -> int:
+        """Process one batch of due events and return how many were processed."""
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            statement = (
+                select(StripeEventModel)
+                .where(StripeEventModel.status == StripeEventStatus.PENDING)
+                .where(StripeEventModel.next_attempt_at <= func.now()) # pylint: disable = E1102
+                .order_by(StripeEventModel.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked = True)
+            )
+            stripe_events = session.exec(statement).all()
+
+            for stripe_event in stripe_events:
+
+                stripe_event.attempts += 1
+
+                try:
+
+                    # The ledger write and the event status commit together, a failure only undoes this event.
+                    with session.begin_nested():
+                        user_id = self.settle(session, stripe_event)
+
+                    app.data.ServiceConfig.authentication.token_cache.invalidate_user(user_id, session)
+
+                    stripe_event.status = StripeEventStatus.PROCESSED
+                    stripe_event.last_error = None
+
+                except IntegrityError:
+
+                    stripe_event.status = StripeEventStatus.IGNORED
+                    stripe_event.last_error = "Payment intent is already settled."
+
+                except (KeyError, TypeError, ValueError, SQLAlchemyError) as exc:
+
+                    stripe_event.last_error = f"{type(exc).__name__}: {exc}"[:1024]
+
+                    if stripe_event.attempts >= self.max_attempts:
+                        stripe_event.status = StripeEventStatus.FAILED
+
+                    else:
+                        stripe_event.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds = self.backoff * 2 ** (stripe_event.attempts - 1))
+
+                session.add(stripe_event)
+
+            session.commit()
+
+        return len(stripe_events)
+
+    def run(self) -> None:
+        """Drain the event log until the process exits."""
+
+        while True:
+
+            try:
+                processed = self.drain()
+
+            except Exception as exc: # pylint: disable = W0718
+
+                logger.error("Stripe event drain failed: %s", exc)
+                processed = 0
+
+            if processed < self.batch_size:
+
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+
+    def start_worker(self) -> None:
+        """Start the background processing thread for this process."""
+
+        if self.worker is not None and self.worker.is_alive():
+            return
+
+        self.worker = threading.Thread(target = self.run, name = "stripe-events", daemon = True)
+        self.worker.start()
@@ -1,14 +1,16 @@
 """Service for stripe operations."""
 
+import json
 import os
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 
 import stripe
-from stripe import Customer, StripeError as StripeException
+from stripe import Customer, Event, StripeError as StripeException
 from stripe.checkout import Session as CheckoutSession
 from stripe.billing_portal import Session as CustomerPortalSession
 
 from app.error_handing import StripeError
+from app.utils.stripe_transport import configure_stripe_client, stripe_calls
 
 
 
@@ -16,11 +18,32 @@ class Stripe:
 
     """Stripe service functions."""
 
+    handled_event_types = frozenset({"checkout.session.completed"})
+
     def __init__(self) -> None:
         stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 
-    def create_customer(self, first_name: str, last_name: str, email: str) -> Customer:
-        """Creates a customer."""
+        configure_stripe_client()
+
+        # Forked workers must not share the parent's pooled sockets.
+        os.register_at_fork(after_in_child = configure_stripe_client)
+
+        # Several secrets can be active at once while a webhook endpoint secret is rotated.
+        self.webhook_secrets = [
+            secret.strip()
+            for secret in os.getenv("STRIPE_WEBHOOK_SECRETS", "").split(",")
+            if secret.strip()
+        ]
+        self.handled_event_markers = tuple(f'"{event_type}"'.encode("utf-8") for event_type in self.handled_event_types)
+
+    @staticmethod
+    def statistics() -> Dict[str, Any]:
+        """Return the Stripe API call latency counters of this worker."""
+
+        return stripe_calls.snapshot()
+
+    def create_customer(self, first_name: str, last_name: str, email: str, user_id: Optional[str] = None) -> Customer:
+        """Creates a customer, idempotently per user when a user id is given."""
 
         if not first_name:
             first_name = ""
@@ -30,10 +53,21 @@ class Stripe:
 
         try:
 
-            customer = stripe.Customer.create(
-                name = f"{first_name} {last_name}",
-                email = email
-            )
+            options = {}
+
+            if user_id:
+
+                options["metadata"] = {
+                    "user_id": user_id,
+                }
+                options["idempotency_key"] = f"customer-create-{user_id}"
+
+            with stripe_calls.timed("customer.create"):
+                customer = stripe.Customer.create(
+                    name = f"{first_name} {last_name}",
+                    email = email,
+                    **options
+                )
 
             return customer
         
@@ -45,6 +79,7 @@ class Stripe:
                     "first_name": first_name,
                     "last_name": last_name,
                     "email": email,
+                    "user_id": user_id,
                 },
                 original_error = exc    
             ) from exc
@@ -65,10 +100,11 @@ class Stripe:
                     "user_id": kwargs["user_id"],
                 }
 
-            customer = stripe.Customer.modify(
-                customer_id,
-                **data
-            )
+            with stripe_calls.timed("customer.modify"):
+                customer = stripe.Customer.modify(
+                    customer_id,
+                    **data
+                )
 
             return customer
         
@@ -90,32 +126,33 @@ class Stripe:
 
             client_url = os.getenv("CLIENT_URL")
 
-            checkout_session = stripe.checkout.Session.create(
-                customer = customer_id,
-                payment_method_types = ["card"],
-                line_items = [
-                    {
-                        "price": price_id,
-                        "quantity": value_in_credits,
+            with stripe_calls.timed("checkout_session.create"):
+                checkout_session = stripe.checkout.Session.create(
+                    customer = customer_id,
+                    payment_method_types = ["card"],
+                    line_items = [
+                        {
+                            "price": price_id,
+                            "quantity": value_in_credits,
+                        },
+                    ],
+                    mode = "payment",
+                    metadata = {
+                        "user_id": user_id,
+                        "value_in_credits": value_in_credits,
+                        "value_in_fiat": value_in_fiat,
                     },
-                ],
-                mode = "payment",
-                metadata = {
-                    "user_id": user_id,
-                    "value_in_credits": value_in_credits,
-                    "value_in_fiat": value_in_fiat,
-                },
-                success_url = f"{client_url}/{return_path}?stripe_status=success",
-                cancel_url = f"{client_url}/{return_path}?stripe_status=cancel",
-                ui_mode = "hosted",
-                allow_promotion_codes = True,
-                billing_address_collection = "required",
-                customer_update = {
-                    "address": "auto",
-                },
-                origin_context = "web",
+                    success_url = f"{client_url}/{return_path}?stripe_status=success",
+                    cancel_url = f"{client_url}/{return_path}?stripe_status=cancel",
+                    ui_mode = "hosted",
+                    allow_promotion_codes = True,
+                    billing_address_collection = "required",
+                    customer_update = {
+                        "address": "auto",
+                    },
+                    origin_context = "web",
 
-            )
+                )
 
             return checkout_session
 
@@ -136,10 +173,11 @@ class Stripe:
 
         try:
 
-            customer_portal_session = stripe.billing_portal.Session.create(
-                customer = customer_id,
-                return_url = os.getenv("STRIPE_RETURN_URL"),
-            )
+            with stripe_calls.timed("portal_session.create"):
+                customer_portal_session = stripe.billing_portal.Session.create(
+                    customer = customer_id,
+                    return_url = os.getenv("STRIPE_RETURN_URL"),
+                )
 
             return customer_portal_session
 
@@ -153,24 +191,42 @@ class Stripe:
                 original_error = exc    
             ) from exc
 
-    def settle_checkout_session(self, webhook_body: str, signature: str) -> Dict[str, Any]:
-        """Settles a checkout session payment."""
+    def ignores_event(self, webhook_body: bytes) -> bool:
+        """Cheaply tell whether a webhook body cannot be a handled event type, before any parsing.
+
+        A handled event always carries its type as a literal JSON string, so a body
+        without any of those strings is safe to acknowledge without verification.
+        """
+
+        return not any(marker in webhook_body for marker in self.handled_event_markers)
+
+    def verify_webhook_event(self, webhook_body: bytes, signature: str) -> Event:
+        """Verifies a webhook event against every active secret and parses it once."""
 
         try:
 
-            event = stripe.Webhook.construct_event(
-                webhook_body, signature, "whsec_FsWSXeC7H2hCIbvcvW4DL1I8bzQNBT6p"
-            )
+            payload = webhook_body.decode("utf-8")
+            error: Optional[StripeException] = None
 
-            if event.type != "checkout.session.completed":
-                raise ValueError
+            for secret in self.webhook_secrets:
 
-            return event.data.object
+                try:
 
-        except StripeException as exc:
+                    stripe.WebhookSignature.verify_header(payload, signature, secret, stripe.Webhook.DEFAULT_TOLERANCE)
+                    break
+
+                except StripeException as exc:
+                    error = exc
+
+            else:
+                raise error or ValueError("No webhook secret is configured.")
+
+            return stripe.Event.construct_from(json.loads(payload), stripe.api_key)
+
+        except (StripeException, ValueError) as exc:
 
             raise StripeError(
-                self.settle_checkout_session.__name__,
+                self.verify_webhook_event.__name__,
                 metadata = {
                     "webhook_body": webhook_body,
                     "signature": signature,
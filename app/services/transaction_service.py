@@ -1,6 +1,11 @@
 """Service for transaction operations."""
 
-from typing import List, Optional
+import base64
+from datetime import datetime
+import json
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import bindparam, tuple_, Row
 from sqlmodel import select, Session, desc
 
 import app.data
@@ -16,13 +21,21 @@ class Transaction:
     def __init__(self) -> None:
         self.database_service = Database(TransactionModel)
 
-    def view(self, transaction_id: str, user_id: str) -> TransactionModel:
-        """View a transaction."""
+    @staticmethod
+    def _find(transaction_id: str, user_id: str) -> Optional[TransactionModel]:
+
+        statement = Database.statement(
+            "transaction.by_id_and_user",
+            lambda: select(TransactionModel).where(TransactionModel.id == bindparam("transaction_id")).where(TransactionModel.user_id == bindparam("user_id"))
+        )
 
         with Session(app.data.engine) as session:  # pylint: disable=E1129
+            return session.exec(statement, params = {"transaction_id": transaction_id, "user_id": user_id}).first()
+
+    def view(self, transaction_id: str, user_id: str) -> TransactionModel:
+        """View a transaction."""
 
-            statement = select(TransactionModel).where(TransactionModel.id == transaction_id).where(TransactionModel.user_id == user_id)
-            transaction = session.exec(statement).first()
+        transaction = self._find(transaction_id, user_id)
 
         if transaction is None:
             raise ValueError
@@ -33,38 +46,91 @@ class Transaction:
         self,
         user_id: str,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
-    ) -> List[TransactionModel]:
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Union[TransactionModel, Row]]:
         """View all transactions."""
 
         if not limit and not offset:
 
             with Session(app.data.engine) as session:  # pylint: disable=E1129
 
-                statement = select(TransactionModel).where(TransactionModel.user_id == user_id).order_by(desc(TransactionModel.created_at)).offset(offset).limit(limit)
-                transactions = session.exec(statement).all()
+                statement = self.database_service.select(columns).where(TransactionModel.user_id == user_id).order_by(desc(TransactionModel.created_at)).offset(offset).limit(limit)
+                transactions = self.database_service.fetch_all(session, statement, columns)
                 
                 return transactions
 
         transactions = []
-        offset = 0
+        cursor = None
 
         while True:
 
-            with Session(app.data.engine) as session:  # pylint: disable=E1129
-
-                statement = select(TransactionModel).where(TransactionModel.user_id == user_id).order_by(desc(TransactionModel.created_at)).offset(offset).limit(limit)
-                results = session.exec(statement).all()
+            results, cursor = self.view_page(user_id, limit, cursor, columns)
 
             transactions.extend(results)
 
-            offset += limit
-
-            if len(results) < 100:
+            if cursor is None:
                 break
 
         return transactions
 
+    def view_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[Any]] = None
+    ) -> Tuple[List[Union[TransactionModel, Row]], Optional[str]]:
+        """View a page of transactions after a cursor, newest first."""
+
+        if limit <= 0:
+            raise ValueError
+
+        # The cursor is built from created_at and id, so projections always carry them.
+        if columns:
+            columns = [*columns, *(column for column in (TransactionModel.created_at, TransactionModel.id) if column not in columns)]
+
+        statement = self.database_service.select(columns).where(TransactionModel.user_id == user_id)
+
+        if cursor:
+
+            created_at, transaction_id = self.decode_cursor(cursor)
+            statement = statement.where(tuple_(TransactionModel.created_at, TransactionModel.id) < tuple_(created_at, transaction_id))
+
+        statement = statement.order_by(desc(TransactionModel.created_at), desc(TransactionModel.id)).limit(limit + 1)
+
+        with Session(app.data.engine) as session:  # pylint: disable=E1129
+            transactions = self.database_service.fetch_all(session, statement, columns)
+
+        if len(transactions) <= limit:
+            return transactions, None
+
+        transactions = transactions[:limit]
+
+        return transactions, self.encode_cursor(transactions[-1])
+
+    @staticmethod
+    def encode_cursor(transaction: Union[TransactionModel, Row]) -> str:
+        """Encode the position of a transaction as an opaque cursor."""
+
+        position = json.dumps([transaction.created_at.isoformat(), transaction.id])
+
+        return base64.urlsafe_b64encode(position.encode("utf-8")).decode("utf-8").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """Decode an opaque cursor into a transaction position."""
+
+        try:
+
+            position = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+            created_at, transaction_id = json.loads(position)
+
+            return datetime.fromisoformat(created_at), str(transaction_id)
+
+        except (TypeError, ValueError) as exc:
+            raise ValueError from exc
+
     def create(
         self,
         user_id: str,
@@ -90,10 +156,7 @@ class Transaction:
     def update(self, transaction_id: str, user_id: str, **kwargs) -> TransactionModel:
         """Update a transaction."""
 
-        with Session(app.data.engine) as session:  # pylint: disable=E1129
-
-            statement = select(TransactionModel).where(TransactionModel.id == transaction_id).where(TransactionModel.user_id == user_id)
-            transaction = session.exec(statement).first()
+        transaction = self._find(transaction_id, user_id)
 
         if transaction is None:
             raise ValueError
@@ -111,10 +174,7 @@ class Transaction:
     def delete(self, transaction_id: str, user_id: str) -> None:
         """Delete a transaction."""
 
-        with Session(app.data.engine) as session:  # pylint: disable=E1129
-
-            statement = select(TransactionModel).where(TransactionModel.id == transaction_id).where(TransactionModel.user_id == user_id)
-            transaction = session.exec(statement).first()
+        transaction = self._find(transaction_id, user_id)
 
         if transaction is None:
             raise ValueError
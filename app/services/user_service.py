@@ -1,11 +1,16 @@
 """Service for user operations."""
 
-from typing import List, Optional
+import math
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-import bcrypt
+from sqlalchemy import bindparam, column as sql_column, insert, update, values, Float, Row, String
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select, Session as SQLModelSession
 
 import app.data
-from app.schemas import User as UserModel
+from app.schemas import OTP as OTPModel, Session as SessionModel, User as UserModel
+from app.schemas.database.otp import OTPType
 from app.schemas.database.transaction import TransactionType, Transaction as TransactionModel
 from app.services import Database
 
@@ -17,17 +22,22 @@ class User:
     def __init__(self) -> None:
         self.database_service = Database(UserModel)
 
-    def create(
+    def signup(
         self,
         first_name: str,
         last_name: str,
         email: str,
         password: str,
         google_user_id: Optional[str] = None,
-        is_active: bool = False
-    ) -> UserModel:
-        """Create a user."""
-        
+        is_active: bool = False,
+        otp_type: Optional[OTPType] = None
+    ) -> Tuple[UserModel, SessionModel, Optional[OTPModel]]:
+        """Create a user with its signup credits, first session and optional OTP in one transaction.
+
+        The Stripe customer is provisioned afterwards by the customer provisioner,
+        or on first purchase in lazy mode.
+        """
+
         user = self.database_service.view(email, UserModel.email)
 
         if user:
@@ -39,25 +49,45 @@ class User:
         if last_name:
             last_name = " ".join(word.capitalize() for word in last_name.split(" "))
 
-        stripe_customer = app.data.ServiceConfig.stripe.create_customer(first_name, last_name, email)
-        
         user = UserModel.model_validate({
             "first_name": first_name,
             "last_name": last_name,
             "email": email,
-            "stripe_customer_id": stripe_customer.id,
-            "password": bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8"),
+            "password": app.data.ServiceConfig.password.hash(password),
             "google_user_id": google_user_id,
             "is_active": is_active,
         })
 
-        user: UserModel = self.database_service.insert(user)
+        transaction = TransactionModel.model_validate({
+            "user_id": user.id,
+            "stripe_payment_intent": None,
+            "description": "Free credits on signup.",
+            "value_in_credits": 100,
+            "value_in_fiat": 1,
+            "type": TransactionType.CREDIT,
+        })
 
-        app.data.ServiceConfig.stripe.update_customer(stripe_customer.id, user_id = user.id)
+        user_session = app.data.ServiceConfig.session.build(user.id)
 
-        app.data.ServiceConfig.transaction.create(user.id, None, "Free credits on signup.", 100, 1, TransactionType.CREDIT)
+        otp = OTPModel.model_validate({"user_id": user.id, "type": otp_type}) if otp_type else None
 
-        return user
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            session.add(user)
+            session.flush()
+
+            session.add_all([row for row in (transaction, user_session, otp) if row is not None])
+            session.commit()
+
+            for row in (user, user_session, otp):
+
+                if row is not None:
+                    session.refresh(row)
+
+        if not app.data.ServiceConfig.customer_provisioner.lazy:
+            app.data.ServiceConfig.customer_provisioner.wakeup.set()
+
+        return user, user_session, otp
 
     def view(self, value: str, column: str) -> UserModel:
         """View a user."""
@@ -75,19 +105,20 @@ class User:
     def view_all(
         self,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
-    ) -> List[UserModel]:
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Union[UserModel, Row]]:
         """View all users."""
 
         if not limit and not offset:
-            return self.database_service.view_all(limit, offset)
+            return self.database_service.view_all(limit, offset, columns)
 
         users = []
         offset = 0
 
         while True:
 
-            results = self.database_service.view_all(offset = offset)
+            results = self.database_service.view_all(offset = offset, columns = columns)
 
             users.extend(results)
 
@@ -98,6 +129,11 @@ class User:
 
         return users
 
+    def stream_all(self, batch_size: int = 1000, columns: Optional[Sequence[Any]] = None) -> Iterator[Union[UserModel, Row]]:
+        """Stream all users."""
+
+        return self.database_service.stream_all(batch_size, columns)
+
     def update(self, value: str, column: str, **kwargs) -> UserModel:
         """Update a user."""
 
@@ -130,10 +166,15 @@ class User:
         if "last_name" in kwargs:
             stripe_data["last_name"] = kwargs["last_name"]
         
-        if stripe_data:
+        if stripe_data and user.stripe_customer_id:
             app.data.ServiceConfig.stripe.update_customer(user.stripe_customer_id, **stripe_data)
 
-        return self.database_service.update(UserModel.model_validate(user.model_dump()))
+        user = self.database_service.update(
+            UserModel.model_validate(user.model_dump()),
+            before_commit = lambda session: app.data.ServiceConfig.authentication.token_cache.invalidate_user(user.id, session)
+        )
+
+        return user
 
     def delete(self, value: str, column: str) -> None:
         """Delete a user."""
@@ -148,51 +189,201 @@ class User:
         if user is None:
             raise ValueError
 
-        return self.database_service.delete(user)
+        self.database_service.delete(
+            user,
+            before_commit = lambda session: app.data.ServiceConfig.authentication.token_cache.invalidate_user(user.id, session)
+        )
 
     def update_credits(self, value: str, column: str, user_credits: float, payment_intent: Optional[str] = None, transaction_description: Optional[str] = None, transaction_type: Optional[TransactionType] = None) -> TransactionModel:
         """Update a user's credits."""
 
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            transaction = self.apply_credits(session, value, column, user_credits, payment_intent, transaction_description, transaction_type)
+
+            app.data.ServiceConfig.authentication.token_cache.invalidate_user(transaction.user_id, session)
+
+            # The balance change, its ledger row and the cache invalidation commit or roll back together.
+            session.commit()
+            session.refresh(transaction)
+
+        return transaction
+
+    def apply_credits(self, session: SQLModelSession, value: str, column: str, user_credits: float, payment_intent: Optional[str] = None, transaction_description: Optional[str] = None, transaction_type: Optional[TransactionType] = None) -> TransactionModel:
+        """Change a user's credits and add its ledger row inside the caller's transaction, without committing."""
+
         if column != UserModel.id and column != UserModel.email:
             raise ValueError
 
-        user: UserModel = self.database_service.view(value, column)
-
-        if user is None:
+        if not math.isfinite(user_credits):
             raise ValueError
 
-        if transaction_type == TransactionType.CREDIT:
-            user_credits += user.credits
-            
-        elif transaction_type == TransactionType.DEBIT:
-            user_credits -= user.credits
+        if transaction_type in (TransactionType.CREDIT, TransactionType.DEBIT):
 
-        credits_difference = user_credits - user.credits
-        credits_difference_absolute = abs(credits_difference)
+            credits_difference = user_credits if transaction_type == TransactionType.CREDIT else -user_credits
+
+            statement = (
+                update(UserModel)
+                .where(column == value)
+                .values(credits = UserModel.credits + credits_difference)
+                .returning(UserModel.id, UserModel.credits)
+            )
+            result = session.execute(statement).first()
+
+            if result is None:
+                raise ValueError
+
+            user_id, user_credits = result
+            previous_credits = user_credits - credits_difference
+
+        else:
+
+            statement = select(UserModel).where(column == value).with_for_update()
+            user: UserModel = session.exec(statement).first()
+
+            if user is None:
+                raise ValueError
+
+            user_id = user.id
+            previous_credits = user.credits
+            credits_difference = user_credits - previous_credits
+
+            user.credits = user_credits
+            session.add(user)
 
         if not transaction_description:
-            transaction_description = f"Admin updated credits from {user.credits} to {user_credits}."
+            transaction_description = f"Admin updated credits from {previous_credits} to {user_credits}."
 
-        user.credits = user_credits
+        transaction = self.ledger_transaction(user_id, credits_difference, transaction_description, payment_intent)
 
-        user = self.database_service.update(UserModel.model_validate(user.model_dump()))
+        session.add(transaction)
+        session.flush()
 
-        applicable_credits_rate = [rate for rate in app.data.credits_rate if rate["lower_limit"] <= credits_difference_absolute <= rate["upper_limit"]]
+        return transaction
+
+    def bulk_update_credits(self, adjustments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply many credit deltas with set-based updates in chunked transactions."""
+
+        chunk_size = int(os.getenv("BULK_CREDITS_CHUNK_SIZE", "500"))
+        results: List[Dict[str, Any]] = [None] * len(adjustments)
+        entries: Dict[int, Dict[str, Any]] = {}
+
+        for index, adjustment in enumerate(adjustments):
+
+            try:
+
+                user_id = str(adjustment["user_id"])
+                delta = round(float(adjustment["delta"]), 2)
+
+                if not delta or not math.isfinite(delta):
+                    raise ValueError
+
+                entries[index] = {
+                    "user_id": user_id,
+                    "delta": delta,
+                    "description": adjustment.get("description", None) or f"Admin adjusted credits by {delta}.",
+                }
+
+            except (AttributeError, KeyError, TypeError, ValueError):
+                results[index] = {"index": index, "status": "invalid"}
+
+        indexes = list(entries)
+
+        for start in range(0, len(indexes), chunk_size):
+
+            chunk = indexes[start:start + chunk_size]
+
+            try:
+                self._apply_credit_chunk(entries, chunk, results)
+
+            except SQLAlchemyError:
+
+                for index in chunk:
+                    results[index] = {"index": index, "user_id": entries[index]["user_id"], "status": "failed"}
+
+        return results
+
+    def _apply_credit_chunk(self, entries: Dict[int, Dict[str, Any]], chunk: List[int], results: List[Dict[str, Any]]) -> None:
+
+        deltas: Dict[str, float] = {}
+
+        # UPDATE ... FROM applies one source row per target, so repeated users are summed first.
+        for index in chunk:
+            deltas[entries[index]["user_id"]] = deltas.get(entries[index]["user_id"], 0) + entries[index]["delta"]
+
+        with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+
+            if app.data.engine.dialect.name == "postgresql":
+
+                source = values(sql_column("id", String), sql_column("delta", Float), name = "adjustments").data(list(deltas.items()))
+
+                statement = (
+                    update(UserModel)
+                    .where(UserModel.id == source.c.id)
+                    .values(credits = UserModel.credits + source.c.delta)
+                    .returning(UserModel.id)
+                )
+                updated = {row[0] for row in session.execute(statement)}
+
+            else:
+
+                # Other dialects lack UPDATE ... FROM (VALUES ...), lock the users that exist and update them in one executemany.
+                statement = select(UserModel.id).where(UserModel.id.in_(list(deltas))).with_for_update()
+                updated = set(session.execute(statement).scalars())
+
+                if updated:
+
+                    table = UserModel.__table__
+                    statement = (
+                        update(table)
+                        .where(table.c.id == bindparam("target_id"))
+                        .values(credits = table.c.credits + bindparam("delta"))
+                    )
+                    session.connection().execute(statement, [{"target_id": user_id, "delta": deltas[user_id]} for user_id in updated])
+
+            transactions = []
+
+            for index in chunk:
+
+                adjustment = entries[index]
+
+                if adjustment["user_id"] not in updated:
+
+                    results[index] = {"index": index, "user_id": adjustment["user_id"], "status": "not_found"}
+                    continue
+
+                transaction = self.ledger_transaction(adjustment["user_id"], adjustment["delta"], adjustment["description"])
+                transactions.append(transaction.model_dump())
+
+                results[index] = {"index": index, "user_id": adjustment["user_id"], "status": "applied", "transaction_id": transaction.id}
+
+            if transactions:
+                session.execute(insert(TransactionModel), transactions)
+
+            for user_id in updated:
+                app.data.ServiceConfig.authentication.token_cache.invalidate_user(user_id, session)
+
+            session.commit()
+
+    @staticmethod
+    def ledger_transaction(user_id: str, credits_difference: float, description: str, payment_intent: Optional[str] = None) -> TransactionModel:
+        """Build the ledger row for a credits change."""
+
+        credits_difference_absolute = abs(credits_difference)
+
+        applicable_credits_rate = app.data.credits_rate.lookup(credits_difference_absolute)
 
         if applicable_credits_rate:
-            value_in_fiat = credits_difference_absolute / applicable_credits_rate[0]["rate"]
+            value_in_fiat = credits_difference_absolute / applicable_credits_rate["rate"]
 
         else:
             value_in_fiat = credits_difference_absolute / 100
 
-        credits_difference_absolute = round(credits_difference_absolute, 2)
-        value_in_fiat = round(value_in_fiat, 2)
-
-        return app.data.ServiceConfig.transaction.create(
-            user.id,
-            payment_intent,
-            transaction_description,
-            credits_difference_absolute,
-            value_in_fiat,
-            TransactionType.CREDIT if credits_difference > 0 else TransactionType.DEBIT
-        )
+        return TransactionModel.model_validate({
+            "user_id": user_id,
+            "stripe_payment_intent": payment_intent,
+            "description": description,
+            "value_in_credits": round(credits_difference_absolute, 2),
+            "value_in_fiat": round(value_in_fiat, 2),
+            "type": TransactionType.CREDIT if credits_difference > 0 else TransactionType.DEBIT,
+        })
@@ -1,190 +1,171 @@
 """API responses utility."""
 
-from typing import Optional, Union, Dict, Any, List
-from flask import jsonify, Response as FlaskResponse
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, Union, Dict, Any, List, Tuple
 
-from app.schemas import Response as ResponseModel
+from flask import Response as FlaskResponse
+import orjson
+from werkzeug.http import http_date
 
 
 
+def serialize_default(value: Any) -> Any:
+    """Serialize values orjson does not handle the way Flask's JSON provider does."""
+
+    if isinstance(value, (datetime, date)):
+        return http_date(value)
+
+    if isinstance(value, Decimal):
+        return str(value)
+
+    raise TypeError
+
+
+def serialize(payload: Any) -> bytes:
+    """Serialize a payload with sorted keys and HTTP dates, matching Flask's jsonify output."""
+
+    # orjson is a compiled extension pylint cannot introspect.
+    return orjson.dumps( # pylint: disable = E1101
+        payload,
+        default = serialize_default,
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE # pylint: disable = E1101
+    )
+
+
+def envelope(status: str, message: str, data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None) -> bytes:
+    """Serialize a response envelope."""
+
+    return serialize({
+        "status": status,
+        "message": message,
+        "data": data,
+    })
+
+
 class APIResponse:
     """API responses utility functions."""
 
+    empty_body_body = envelope("error", "Request body is empty.")
+    schema_body = envelope("error", "One or more required parameters are either not given or have invalid schema.")
+    authentication_body = envelope("error", "Authorization header or OTP is either missing, invalid or expired.")
+    authentication_2fa_body = envelope("error", "Authorization header or OTP is either missing, invalid or expired.", {"is_2fa_enabled": True})
+    resource_access_body = envelope("error", "You do not have access to the requested resource.")
+    user_inactive_body = envelope("error", "Please activate your account to access the requested resource.")
+    credits_body = envelope("error", "You do not have enough credits to perform this action.")
+    credits_rate_not_found_body = envelope("error", "No credits rate found for the given amount.")
+    route_not_found_body = envelope("error", "The requested route does not exist.")
+    method_not_allowed_body = envelope("error", "The requested method is not allowed for this route.")
+    rate_limit_body = envelope("error", "You have exceeded the rate limit.")
+    unidentified_body = envelope("error", "Something went wrong.")
+
+    resource_presence_bodies: Dict[Tuple[str, bool], bytes] = {}
+
     def __init__(self) -> None:
         pass
 
+    @staticmethod
+    def raw(body: bytes, status_code: int = 200) -> FlaskResponse:
+        """Response from an already serialized body."""
+
+        return FlaskResponse(body, status_code, mimetype = "application/json")
+
     @staticmethod
     def success(message: str, data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None, status_code: int = 200) -> FlaskResponse:
         """Success response."""
-        
-        response = ResponseModel(
-            status = "success",
-            message = message,
-            data = data
-        )
 
-        return jsonify(response.model_dump()), status_code
+        return APIResponse.raw(envelope("success", message, data), status_code)
 
     @staticmethod
     def empty_body_error() -> FlaskResponse:
         """Empty body error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "Request body is empty.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 400
+        return APIResponse.raw(APIResponse.empty_body_body, 400)
     
     @staticmethod
     def schema_error() -> FlaskResponse:
         """Schema error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "One or more required parameters are either not given or have invalid schema.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 400
+        return APIResponse.raw(APIResponse.schema_body, 400)
 
     @staticmethod
     def authentication_error(is_2fa_enabled: bool = False) -> FlaskResponse:
         """Authentication error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "Authorization header or OTP is either missing, invalid or expired.",
-            data = None
-        )
-
         if is_2fa_enabled:
-            response.data = {"is_2fa_enabled": True}
+            return APIResponse.raw(APIResponse.authentication_2fa_body, 401)
 
-        return jsonify(response.model_dump()), 401
+        return APIResponse.raw(APIResponse.authentication_body, 401)
 
     @staticmethod
     def resource_presence_error(resource: str, found: bool = False) -> FlaskResponse:
         """Resource presence error."""
 
-        if not found:
+        body = APIResponse.resource_presence_bodies.get((resource, found), None)
 
-            message = f"{resource} with the given identifier does not exist."
-            status_code = 404
+        if body is None:
 
-        else:
+            if not found:
+                message = f"{resource} with the given identifier does not exist."
 
-            message = f"{resource} with the given identifier already exists."
-            status_code = 400
+            else:
+                message = f"{resource} with the given identifier already exists."
 
-        response = ResponseModel(
-            status = "error",
-            message = message,
-            data = None
-        )
+            body = envelope("error", message)
+            APIResponse.resource_presence_bodies[(resource, found)] = body
 
-        return jsonify(response.model_dump()), status_code
+        return APIResponse.raw(body, 400 if found else 404)
 
     @staticmethod
     def resource_access_error() -> FlaskResponse:
         """Resource access error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "You do not have access to the requested resource.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 403
+        return APIResponse.raw(APIResponse.resource_access_body, 403)
     
     @staticmethod
     def user_inactive_error() -> FlaskResponse:
         """User inactive error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "Please activate your account to access the requested resource.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 401
+        return APIResponse.raw(APIResponse.user_inactive_body, 401)
     
     @staticmethod
     def credits_error() -> FlaskResponse:
         """Credits error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "You do not have enough credits to perform this action.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 403
+        return APIResponse.raw(APIResponse.credits_body, 403)
 
     @staticmethod
     def credits_rate_not_found_error() -> FlaskResponse:
         """Credits rate not found error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "No credits rate found for the given amount.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 404
+        return APIResponse.raw(APIResponse.credits_rate_not_found_body, 404)
 
     @staticmethod
     def route_not_found_error() -> FlaskResponse:
         """Route not found error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "The requested route does not exist.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 404
+        return APIResponse.raw(APIResponse.route_not_found_body, 404)
     
     @staticmethod
     def method_not_allowed_error() -> FlaskResponse:
         """Method not allowed error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "The requested method is not allowed for this route.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 405
+        return APIResponse.raw(APIResponse.method_not_allowed_body, 405)
 
     @staticmethod
     def rate_limit_error() -> FlaskResponse:
         """Rate limit error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "You have exceeded the rate limit.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 429
+        return APIResponse.raw(APIResponse.rate_limit_body, 429)
     
     @staticmethod
     def unidentified_error() -> FlaskResponse:
         """Unidentified error."""
 
-        response = ResponseModel(
-            status = "error",
-            message = "Something went wrong.",
-            data = None
-        )
-
-        return jsonify(response.model_dump()), 500
+        return APIResponse.raw(APIResponse.unidentified_body, 500)
 
     @staticmethod
     def null() -> FlaskResponse:
         """Null response."""
 
         return "", 204
-        
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""Credits rate lookup table utility."""
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.utils.logging_config import get_logger
+
+
+
+logger = get_logger("credits_rate")
+
+
+class CreditsRateSnapshot(NamedTuple):
+    """Immutable, validated set of credits rate tiers."""
+
+    tiers: Tuple[Mapping[str, Any], ...]
+    lower_limits: Tuple[float, ...]
+    etag: str
+
+
+def build_snapshot(tiers: List[Dict[str, Any]]) -> CreditsRateSnapshot:
+    """Sort and validate tiers, raising ValueError on malformed or overlapping tiers."""
+
+    validated = []
+
+    for tier in tiers:
+
+        try:
+
+            tier = {
+                "lower_limit": tier["lower_limit"],
+                "upper_limit": tier["upper_limit"],
+                "rate": tier["rate"],
+                "stripe_price_id": tier.get("stripe_price_id", None),
+            }
+
+            if not all(isinstance(tier[key], (int, float)) for key in ("lower_limit", "upper_limit", "rate")):
+                raise TypeError
+
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Malformed credits rate tier: {tier}") from exc
+
+        if tier["lower_limit"] > tier["upper_limit"] or tier["rate"] <= 0:
+            raise ValueError(f"Invalid credits rate tier: {tier}")
+
+        validated.append(tier)
+
+    validated.sort(key = lambda tier: tier["lower_limit"])
+
+    for previous, current in zip(validated, validated[1:]):
+
+        if current["lower_limit"] <= previous["upper_limit"]:
+            raise ValueError(f"Overlapping credits rate tiers: {previous} and {current}")
+
+    etag = hashlib.sha256(json.dumps(validated, sort_keys = True).encode("utf-8")).hexdigest()[:32]
+
+    return CreditsRateSnapshot(
+        tiers = tuple(MappingProxyType(tier) for tier in validated),
+        lower_limits = tuple(tier["lower_limit"] for tier in validated),
+        etag = etag
+    )
+
+
+class CreditsRate:
+    """Credits rate tiers with bisect lookup and hot reload from a config file or env."""
+
+    def __init__(self, default_tiers: List[Dict[str, Any]]) -> None:
+        self.default_tiers = default_tiers
+        self.file_path = os.getenv("CREDITS_RATE_FILE", None)
+        self.reload_interval = float(os.getenv("CREDITS_RATE_RELOAD_SECONDS", "5"))
+        self.lock = threading.Lock()
+        self.file_mtime: Optional[float] = None
+        self.checked_at = 0.0
+        self.snapshot = build_snapshot(self._read())
+
+    def _read(self) -> List[Dict[str, Any]]:
+
+        if self.file_path:
+
+            self.file_mtime = os.stat(self.file_path).st_mtime
+
+            with open(self.file_path, "r", encoding = "utf-8") as file:
+                return json.load(file)
+
+        if os.getenv("CREDITS_RATE", None):
+            return json.loads(os.getenv("CREDITS_RATE"))
+
+        return self.default_tiers
+
+    def reload(self) -> None:
+        """Reload the tiers, keeping the current ones if the new ones are invalid."""
+
+        with self.lock:
+
+            try:
+                self.snapshot = build_snapshot(self._read())
+
+            except (OSError, ValueError) as exc:
+                logger.error("Credits rate reload failed, keeping current tiers: %s", exc)
+
+    def _reload_if_changed(self) -> None:
+
+        if not self.file_path or time.monotonic() - self.checked_at < self.reload_interval:
+            return
+
+        self.checked_at = time.monotonic()
+
+        try:
+            changed = os.stat(self.file_path).st_mtime != self.file_mtime
+
+        except OSError:
+            return
+
+        if changed:
+            self.reload()
+
+    def current(self) -> CreditsRateSnapshot:
+        """Get the current snapshot."""
+
+        self._reload_if_changed()
+
+        return self.snapshot
+
+    def lookup(self, amount: float) -> Optional[Mapping[str, Any]]:
+        """Find the tier covering an amount."""
+
+        snapshot = self.current()
+        index = bisect.bisect_right(snapshot.lower_limits, amount) - 1
+
+        if index < 0 or amount > snapshot.tiers[index]["upper_limit"]:
+            return None
+
+        return snapshot.tiers[index]
@@ -0,0 +1,131 @@
+"""Database connection pool utility."""
+
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+
+class PoolStatistics:
+    """Connection pool checkout and wait statistics."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters."""
+
+        with self.lock:
+
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, duration: float, timed_out: bool = False) -> None:
+        """Record the time spent waiting for a pooled connection."""
+
+        with self.lock:
+
+            self.wait_count += 1
+            self.wait_total += duration
+            self.wait_max = max(self.wait_max, duration)
+
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        """Increment a named counter."""
+
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, engine: Engine = None) -> Dict[str, Any]:
+        """Return the current statistics."""
+
+        with self.lock:
+
+            statistics = {
+                "pid": os.getpid(),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_average_ms": round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+        if engine is not None and isinstance(engine.pool, QueuePool):
+
+            statistics["size"] = engine.pool.size()
+            statistics["checked_in"] = engine.pool.checkedin()
+            statistics["checked_out"] = engine.pool.checkedout()
+            statistics["overflow"] = engine.pool.overflow()
+
+        return statistics
+
+
+pool_statistics = PoolStatistics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def _do_get(self) -> Any:
+
+        start = time.perf_counter()
+
+        try:
+            connection = super()._do_get()
+
+        # Connect and authentication errors propagate as they are, only an exhausted pool is a timeout.
+        except PoolTimeoutError:
+
+            pool_statistics.record_wait(time.perf_counter() - start, timed_out = True)
+            raise
+
+        pool_statistics.record_wait(time.perf_counter() - start)
+
+        return connection
+
+
+def pool_options() -> Dict[str, Any]:
+    """Build the engine pool options from the environment."""
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true",
+        "pool_use_lifo": True,
+    }
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Attach pool event listeners to an engine."""
+
+    event.listen(engine, "connect", lambda *_args: pool_statistics.increment("connects"))
+    event.listen(engine, "checkout", lambda *_args: pool_statistics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *_args: pool_statistics.increment("checkins"))
+    event.listen(engine, "invalidate", lambda *_args: pool_statistics.increment("invalidations"))
+
+
+def dispose_after_fork(engine: Engine) -> None:
+    """Give a forked worker its own pool without closing the parent's connections."""
+
+    engine.dispose(close = False)
+    pool_statistics.reset()
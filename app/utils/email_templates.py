@@ -0,0 +1,77 @@
+"""Email template utility."""
+
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+
+
+class EmailTemplate:
+    """Template precompiled into literal segments and named slots."""
+
+    def __init__(self, source: str, slots: Tuple[str, ...]) -> None:
+        self.segments: List[str] = []
+        self.slot_names: List[str] = []
+
+        pattern = re.compile("|".join(f"<{re.escape(slot)}>" for slot in slots))
+        position = 0
+
+        for match in pattern.finditer(source):
+
+            self.segments.append(source[position:match.start()])
+            self.slot_names.append(match.group(0)[1:-1])
+            position = match.end()
+
+        self.segments.append(source[position:])
+
+    def render(self, **values: str) -> str:
+        """Fill the slots in a single join, leaving unfilled slots as they were."""
+
+        parts = [self.segments[0]]
+
+        for name, segment in zip(self.slot_names, self.segments[1:]):
+
+            parts.append(values.get(name, f"<{name}>"))
+            parts.append(segment)
+
+        return "".join(parts)
+
+
+class EmailTemplates:
+    """Email templates loaded once, with optional mtime based hot reload."""
+
+    slots = ("url", "code", "password")
+
+    def __init__(self, directory: str, reload: bool = False) -> None:
+        self.directory = directory
+        self.reload = reload
+        self.lock = threading.Lock()
+        self.templates: Dict[str, Tuple[float, EmailTemplate]] = {}
+
+        for file_name in os.listdir(directory):
+
+            if file_name.endswith(".html"):
+                self._load(file_name)
+
+    def _load(self, file_name: str) -> EmailTemplate:
+
+        path = os.path.join(self.directory, file_name)
+
+        with open(path, "r", encoding = "utf-8") as file:
+            template = EmailTemplate(file.read(), self.slots)
+
+        with self.lock:
+            self.templates[file_name] = (os.stat(path).st_mtime, template)
+
+        return template
+
+    def get(self, file_name: str) -> EmailTemplate:
+        """Get a compiled template."""
+
+        mtime, template = self.templates[file_name]
+
+        if self.reload and os.stat(os.path.join(self.directory, file_name)).st_mtime != mtime:
+            return self._load(file_name)
+
+        return template
@@ -0,0 +1,42 @@
+"""Email transport utility."""
+
+import threading
+from typing import Any, Dict, List
+import uuid
+
+
+
+class StubSESClient:
+    """Local stand-in for the boto3 SES client that records messages instead of sending them."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sent: List[Dict[str, Any]] = []
+
+    def send_email(self, **kwargs) -> Dict[str, Any]:
+        """Record a message."""
+
+        with self.lock:
+            self.sent.append(kwargs)
+
+        return {
+            "MessageId": uuid.uuid4().hex,
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        }
+
+    def send_bulk_templated_email(self, **kwargs) -> Dict[str, Any]:
+        """Record a bulk templated message."""
+
+        with self.lock:
+            self.sent.append(kwargs)
+
+        return {
+            "Status": [{"Status": "Success", "MessageId": uuid.uuid4().hex} for _ in kwargs["Destinations"]],
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        }
+
+    def clear(self) -> None:
+        """Forget all recorded messages."""
+
+        with self.lock:
+            self.sent.clear()
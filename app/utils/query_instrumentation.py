@@ -0,0 +1,131 @@
+"""Database query instrumentation utility."""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+from flask import has_request_context, request
+from sqlalchemy import Engine, event
+
+from app.utils.logging_config import get_logger
+
+
+
+logger = get_logger("database")
+
+
+class QueryHistogram:
+    """In-process histogram of statement execution times, counting those over the slow threshold."""
+
+    buckets_ms = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+    def __init__(self, slow_ms: float = 200.0) -> None:
+        self.slow_ms = slow_ms
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the histogram."""
+
+        with self.lock:
+
+            self.counts = [0] * (len(self.buckets_ms) + 1)
+            self.total = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+            self.slow = 0
+
+    def record(self, duration_ms: float) -> bool:
+        """Record a statement execution time and return whether it was slow."""
+
+        index = bisect.bisect_left(self.buckets_ms, duration_ms)
+        slow = duration_ms >= self.slow_ms
+
+        with self.lock:
+
+            self.counts[index] += 1
+            self.total += 1
+            self.total_ms += duration_ms
+            self.max_ms = max(self.max_ms, duration_ms)
+
+            if slow:
+                self.slow += 1
+
+        return slow
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current histogram."""
+
+        with self.lock:
+
+            buckets = {f"le_{bound}ms": count for bound, count in zip(self.buckets_ms, self.counts)}
+            buckets["inf"] = self.counts[-1]
+
+            return {
+                "count": self.total,
+                "slow": self.slow,
+                "average_ms": round(self.total_ms / self.total, 3) if self.total else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "buckets": buckets,
+            }
+
+
+query_histogram = QueryHistogram()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describe bound parameters by type only, never by value."""
+
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"rows": len(parameters), "shape": parameter_shape(parameters[0])}
+
+        return [type(value).__name__ for value in parameters]
+
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, *_args) -> None:
+
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, parameters, _context, executemany) -> None:
+
+    start: List[float] = conn.info.get("query_start")
+
+    if not start:
+        return
+
+    duration_ms = (time.perf_counter() - start.pop()) * 1000
+
+    if query_histogram.record(duration_ms):
+
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(duration_ms, 3),
+            "endpoint": request.endpoint if has_request_context() else None,
+            "statement": " ".join(statement.split()),
+            "parameters": parameter_shape(parameters),
+            "executemany": executemany,
+        }))
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Attach query timing listeners to an engine."""
+
+    query_histogram.slow_ms = float(os.getenv("DATABASE_SLOW_QUERY_MS", "200"))
+
+    # The application logs at ERROR, slow queries must still get through.
+    logger.setLevel(logging.WARNING)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
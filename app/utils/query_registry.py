@@ -0,0 +1,98 @@
+"""Database query registry utility."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import default
+
+
+
+class QueryRegistry:
+    """Hot statements built once with bind parameters, plus compiled cache counters."""
+
+    cache_outcomes = {
+        default.CACHE_HIT: "hits",
+        default.CACHE_MISS: "misses",
+        default.CACHING_DISABLED: "disabled",
+        default.NO_CACHE_KEY: "uncacheable",
+    }
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.statements: Dict[Hashable, Any] = {}
+        self.cache_size = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the counters."""
+
+        with self.lock:
+
+            self.registry_hits = 0
+            self.registry_misses = 0
+            self.compiled = {outcome: 0 for outcome in self.cache_outcomes.values()}
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """Get a registered statement, building it on first use."""
+
+        statement = self.statements.get(key)
+
+        if statement is not None:
+
+            with self.lock:
+                self.registry_hits += 1
+
+            return statement
+
+        statement = builder()
+
+        with self.lock:
+
+            self.registry_misses += 1
+            self.statements.setdefault(key, statement)
+
+        return statement
+
+    def record(self, context: Any) -> None:
+        """Record whether a statement was served from the compiled cache."""
+
+        outcome = self.cache_outcomes.get(getattr(context, "cache_hit", None))
+
+        if outcome is None:
+            return
+
+        with self.lock:
+            self.compiled[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the registry and compiled cache counters."""
+
+        with self.lock:
+
+            lookups = self.compiled["hits"] + self.compiled["misses"]
+
+            return {
+                "registered_statements": len(self.statements),
+                "registry_hits": self.registry_hits,
+                "registry_misses": self.registry_misses,
+                "compiled_cache_size": self.cache_size,
+                "compiled_cache": dict(self.compiled),
+                "compiled_cache_hit_ratio": round(self.compiled["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+query_registry = QueryRegistry()
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+
+    query_registry.record(context)
+
+
+def instrument_compiled_cache(engine: Engine, cache_size: int) -> None:
+    """Attach compiled cache counters to an engine."""
+
+    query_registry.cache_size = cache_size
+
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,105 @@
+"""Rate limit storage utility."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple, Type, Union
+
+from limits.storage import Storage
+
+
+
+class SQLiteStorage(Storage):
+    """Rate limit counters in a local SQLite file shared by every worker on the host."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options) -> None:
+        super().__init__(uri, wrap_exceptions = wrap_exceptions, **options)
+
+        self.path = uri[len("sqlite://"):]
+        self.local = threading.local()
+
+        # Connections are per thread, an in-memory database would give each thread its own empty counters.
+        if not self.path or ":memory:" in self.path:
+            raise ValueError("SQLite rate limit storage needs a file path, e.g. sqlite:///path/to/limits.db")
+
+        self.connection.execute("SELECT 1")
+
+    @property
+    def base_exceptions(self) -> Union[Type[Exception], Tuple[Type[Exception], ...]]:
+        return sqlite3.Error
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection for the current thread, reopened after a fork."""
+
+        if getattr(self.local, "pid", None) != os.getpid():
+
+            self.local.connection = sqlite3.connect(self.path, timeout = 5, isolation_level = None, check_same_thread = False)
+            self.local.connection.execute("PRAGMA journal_mode = WAL")
+            self.local.connection.execute("PRAGMA synchronous = NORMAL")
+            self.local.connection.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)")
+            self.local.pid = os.getpid()
+
+        return self.local.connection
+
+    def _execute(self, statement: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        return self.connection.execute(statement, parameters)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        connection = self.connection
+
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+
+            self.local.calls = getattr(self.local, "calls", 0) + 1
+
+            if self.local.calls % 1000 == 0:
+                connection.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+
+            else:
+                connection.execute("DELETE FROM rate_limits WHERE key = ? AND expires_at <= ?", (key, now))
+
+            connection.execute(
+                "INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                (key, amount, now + expiry)
+            )
+            value = connection.execute("SELECT value FROM rate_limits WHERE key = ?", (key,)).fetchone()[0]
+            connection.execute("COMMIT")
+
+        except sqlite3.Error:
+
+            connection.execute("ROLLBACK")
+            raise
+
+        return value
+
+    def get(self, key: str) -> int:
+        row = self._execute("SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> int:
+        row = self._execute("SELECT expires_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+
+        return int(row[0]) if row else int(time.time())
+
+    def check(self) -> bool:
+        try:
+
+            self._execute("SELECT 1")
+            return True
+
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        return self._execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._execute("DELETE FROM rate_limits WHERE key = ?", (key,))
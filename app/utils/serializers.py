@@ -0,0 +1,62 @@
+"""Field projection serializers utility."""
+
+from operator import attrgetter
+import os
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+from sqlmodel import SQLModel
+
+from app.schemas import Transaction as TransactionModel, User as UserModel
+
+
+
+class Projection:
+    """Fixed set of fields read straight off a row, compiled once.
+
+    The same projection gives the columns to select, so list queries can return
+    lightweight rows instead of hydrating whole models.
+    """
+
+    def __init__(self, model: SQLModel, fields: Tuple[str, ...]) -> None:
+        self.fields = fields
+        self.columns = tuple(getattr(model, field) for field in fields)
+        self.getter = attrgetter(*fields)
+
+    def __call__(self, row: Any, **extra: Any) -> Dict[str, Any]:
+        """Project one row, adding any extra keys."""
+
+        values = self.getter(row)
+
+        if len(self.fields) == 1:
+            values = (values,)
+
+        data = dict(zip(self.fields, values))
+
+        if extra:
+            data.update(extra)
+
+        return data
+
+    def many(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Project many rows."""
+
+        return [self(row) for row in rows]
+
+
+class Serializer:
+    """Public and private projections of a model."""
+
+    def __init__(self, model: SQLModel, private_fields: FrozenSet[str] = frozenset()) -> None:
+        fields = tuple(model.model_fields)
+
+        self.private = Projection(model, fields)
+        self.public = Projection(model, tuple(field for field in fields if field not in private_fields))
+
+    def for_role(self, role: str) -> Projection:
+        """Projection for a caller role."""
+
+        return self.private if role == os.getenv("PRIVATE_ROLE") else self.public
+
+
+user_serializer = Serializer(UserModel, frozenset({"password", "stripe_customer_id", "google_user_id"}))
+transaction_serializer = Serializer(TransactionModel, frozenset({"stripe_payment_intent"}))
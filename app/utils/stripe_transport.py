@@ -0,0 +1,87 @@
+"""Stripe transport utility."""
+
+from contextlib import contextmanager
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+import stripe
+
+
+
+class StripeCallStatistics:
+    """In-process latency counters of Stripe API calls, per operation."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.operations: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, duration_ms: float, failed: bool = False) -> None:
+        """Record one Stripe API call."""
+
+        with self.lock:
+
+            entry = self.operations.setdefault(operation, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+
+            if failed:
+                entry["errors"] += 1
+
+    @contextmanager
+    def timed(self, operation: str) -> Iterator[None]:
+        """Time the Stripe API call made inside the block."""
+
+        start = time.perf_counter()
+        failed = True
+
+        try:
+
+            yield
+            failed = False
+
+        finally:
+            self.record(operation, (time.perf_counter() - start) * 1000, failed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current counters."""
+
+        with self.lock:
+
+            return {
+                operation: {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "average_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else 0.0,
+                    "max_ms": round(entry["max_ms"], 3),
+                }
+                for operation, entry in self.operations.items()
+            }
+
+
+stripe_calls = StripeCallStatistics()
+
+
+def configure_stripe_client() -> None:
+    """Give the Stripe library a pooled keep-alive HTTP client with timeouts and retries."""
+
+    pool_size = int(os.getenv("STRIPE_HTTP_POOL_SIZE", "10"))
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections = 1, pool_maxsize = pool_size))
+
+    stripe.default_http_client = stripe.RequestsClient(
+        timeout = (
+            float(os.getenv("STRIPE_CONNECT_TIMEOUT_SECONDS", "5")),
+            float(os.getenv("STRIPE_READ_TIMEOUT_SECONDS", "30")),
+        ),
+        session = session
+    )
+
+    # Retried POSTs reuse an idempotency key the library generates, so they never apply twice.
+    stripe.max_network_retries = int(os.getenv("STRIPE_MAX_NETWORK_RETRIES", "2"))
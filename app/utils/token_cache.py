@@ -0,0 +1,162 @@
+"""Validated session token cache utility."""
+
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+
+
+class TokenCache:
+    """Bounded LRU cache with TTL for validated session tokens.
+
+    Entries are only served while ``is_consistent`` says invalidations from other
+    workers are being received, otherwise every lookup is a miss. Invalidations
+    given a database session are broadcast through ``publish`` inside that
+    session's transaction, so they reach the other workers when the write commits.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[float, Any, Any]]" = OrderedDict()
+        self.user_keys: Dict[str, Set[str]] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.is_consistent: Callable[[], bool] = lambda: False
+        self.publish: Callable[[Any, str], None] = lambda session, message: None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache may serve entries right now."""
+
+        return self.max_size > 0 and self.ttl > 0 and self.is_consistent()
+
+    @staticmethod
+    def key(token: str) -> str:
+        """Hash a token so raw tokens never sit in memory as keys."""
+
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Tuple[Any, Any]]:
+        """Get the cached session and user for a token."""
+
+        if not self.enabled:
+            return None
+
+        key = self.key(token)
+
+        with self.lock:
+
+            entry = self.entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+
+                if entry is not None:
+                    self._remove(key)
+
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[1], entry[2]
+
+    def set(self, token: str, session: Any, user: Any, generation: Optional[int] = None) -> None:
+        """Cache the session and user for a token.
+
+        Pass the generation read before loading the rows, an invalidation that
+        landed in between means they may already be stale and are not cached.
+        """
+
+        if not self.enabled:
+            return
+
+        key = self.key(token)
+
+        with self.lock:
+
+            if generation is not None and generation != self.generation:
+                return
+
+            if key in self.entries:
+                self._remove(key)
+
+            self.entries[key] = (time.monotonic() + self.ttl, session, user)
+            self.user_keys.setdefault(user.id, set()).add(key)
+
+            while len(self.entries) > self.max_size:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate_token(self, token: str, session: Any = None) -> None:
+        """Drop a single token, in every worker when called with the session about to commit the change."""
+
+        self.apply(f"token:{self.key(token)}", session)
+
+    def invalidate_user(self, user_id: str, session: Any = None) -> None:
+        """Drop every token of a user, in every worker when called with the session about to commit the change."""
+
+        self.apply(f"user:{user_id}", session)
+
+    def apply(self, message: str, session: Any = None) -> None:
+        """Apply an invalidation message, broadcasting it with the session's transaction when one is given."""
+
+        kind, _, value = message.partition(":")
+
+        with self.lock:
+
+            self.generation += 1
+
+            if kind == "token":
+                self._remove(value)
+
+            elif kind == "user":
+
+                for key in list(self.user_keys.get(value, ())):
+                    self._remove(key)
+
+        if session is not None:
+            self.publish(session, message)
+
+    def clear(self) -> None:
+        """Drop every token."""
+
+        with self.lock:
+
+            self.generation += 1
+            self.entries.clear()
+            self.user_keys.clear()
+
+    def statistics(self) -> Dict[str, Any]:
+        """Return the cache statistics."""
+
+        with self.lock:
+
+            return {
+                "enabled": self.enabled,
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key: str) -> None:
+
+        entry = self.entries.pop(key, None)
+
+        if entry is None:
+            return
+
+        keys = self.user_keys.get(entry[2].id)
+
+        if keys is not None:
+
+            keys.discard(key)
+
+            if not keys:
+                del self.user_keys[entry[2].id]
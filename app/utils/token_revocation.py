@@ -0,0 +1,114 @@
+"""Cross worker token cache invalidation utility."""
+
+import os
+import select
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import Engine, text
+
+from app.utils.logging_config import get_logger
+from app.utils.token_cache import TokenCache
+
+
+
+logger = get_logger("token_revocation")
+
+
+class TokenRevocations:
+    """Token cache invalidations shared between workers over Postgres LISTEN/NOTIFY.
+
+    Each worker keeps one listening connection. While it is down the cache is
+    cleared and bypassed, so a missed notification can never serve a revoked token.
+    """
+
+    channel = "token_cache_revocations"
+
+    def __init__(self, engine: Engine, cache: TokenCache, reconnect_seconds: float = 5.0) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.reconnect_seconds = reconnect_seconds
+        self.lock = threading.Lock()
+        self.worker: Optional[threading.Thread] = None
+        self.worker_pid: Optional[int] = None
+        self.listening_pid: Optional[int] = None
+
+        cache.is_consistent = self.is_listening
+        cache.publish = self.publish
+
+    def is_listening(self) -> bool:
+        """Whether this process currently receives invalidations, starting the listener if needed."""
+
+        if self.worker_pid != os.getpid():
+            self.start_worker()
+
+        return self.listening_pid == os.getpid()
+
+    def publish(self, session: Any, message: str) -> None:
+        """Queue an invalidation on the caller's transaction, Postgres delivers it to every worker on commit."""
+
+        session.execute(text("SELECT pg_notify(:channel, :message)"), {"channel": self.channel, "message": message})
+
+    def listen(self) -> None:
+        """Receive invalidations until the connection fails."""
+
+        pooled_connection = self.engine.raw_connection()
+        pooled_connection.detach()
+
+        connection = pooled_connection.driver_connection
+        connection.autocommit = True
+
+        try:
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+
+            # Anything cached before the listener was up may already be stale.
+            self.cache.clear()
+            self.listening_pid = os.getpid()
+
+            while True:
+
+                if not select.select([connection], [], [], 60)[0]:
+
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+
+                    continue
+
+                connection.poll()
+
+                while connection.notifies:
+                    self.cache.apply(connection.notifies.pop(0).payload)
+
+        finally:
+
+            self.listening_pid = None
+            self.cache.clear()
+            connection.close()
+
+    def run(self) -> None:
+        """Keep a listener connected until the process exits."""
+
+        while True:
+
+            try:
+                self.listen()
+
+            except Exception as exc: # pylint: disable = W0718
+                logger.error("Token revocation listener failed: %s", exc)
+
+            time.sleep(self.reconnect_seconds)
+
+    def start_worker(self) -> None:
+        """Start the listener thread for this process."""
+
+        with self.lock:
+
+            if self.worker_pid == os.getpid():
+                return
+
+            self.worker = threading.Thread(target = self.run, name = "token-revocations", daemon = True)
+            self.worker.start()
+            self.worker_pid = os.getpid()
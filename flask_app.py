@@ -1,7 +1,11 @@
 """Main application file."""
 
+import base64
+import binascii
+import hashlib
 import os
 import sys
+from typing import Callable
 
 from flask import Flask, Response as FlaskResponse, redirect, url_for, request
 from flask_cors import CORS
@@ -12,6 +16,7 @@ import setup # pylint: disable = W0611
 
 from app.utils.api_responses import APIResponse
 from app.utils.logging_config import setup_logging, get_logger
+from app.utils.rate_limit_storage import SQLiteStorage # pylint: disable = W0611
 from app.routes import (
     AuthenticationRoute as AuthRoute,
     MiscRoute,
@@ -25,12 +30,53 @@ from app.routes import (
 app = Flask(__name__)
 CORS(app, resources = {"/*": {"origins": "*"}})
 
+def rate_limit_key() -> str:
+    """Rate limit key for the caller, hashed so credentials never reach the storage backend."""
+
+    authorization = request.headers.get(os.getenv("AUTHORIZATION_HEADER"), None)
+
+    if authorization is None:
+        return get_remote_address()
+
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+def basic_auth_email_key() -> str:
+    """Rate limit key for the account named in Basic credentials, whatever password is tried."""
+
+    authorization = request.headers.get(os.getenv("AUTHORIZATION_HEADER"), "").split(" ")
+
+    try:
+
+        if authorization[0] != "Basic":
+            raise ValueError
+
+        email = base64.b64decode(authorization[1].encode("utf-8")).decode("utf-8").split(":")[0].strip().lower()
+
+    except (IndexError, ValueError, binascii.Error):
+        return f"basic:{get_remote_address()}"
+
+    return f"email:{hashlib.sha256(email.encode('utf-8')).hexdigest()}"
+
 limiter = Limiter(
     app = app,
-    key_func = lambda: request.headers.get(os.getenv("AUTHORIZATION_HEADER"), get_remote_address()),
-    default_limits = [os.getenv("RATE_LIMIT")]
+    key_func = rate_limit_key,
+    default_limits = [os.getenv("RATE_LIMIT")],
+    storage_uri = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
 )
 
+def route_limit(view_func: Callable, env_name: str, *key_funcs: Callable[[], str]) -> Callable:
+    """Apply a route specific rate limit when one is configured, counted separately for each key function."""
+
+    limit = os.getenv(env_name, None)
+
+    if not limit:
+        return view_func
+
+    for key_func in key_funcs or (rate_limit_key,):
+        view_func = limiter.limit(limit, key_func = key_func)(view_func)
+
+    return view_func
+
 setup_logging("ERROR", os.path.join("app", "logs", "error.log"), service_name = "app")
 logger = get_logger("app")
 
@@ -84,9 +130,9 @@ def allow_only_https() -> FlaskResponse:
 API_BASE = os.getenv("API_BASE", "/api/v1")
 
 
-app.add_url_rule(f"{API_BASE}/auth/register", "register", view_func = AuthRoute.register, methods = ["POST"])
+app.add_url_rule(f"{API_BASE}/auth/register", "register", view_func = route_limit(AuthRoute.register, "RATE_LIMIT_AUTH_REGISTER", get_remote_address), methods = ["POST"])
 app.add_url_rule(f"{API_BASE}/auth/google", "google_oauth", view_func = AuthRoute.google_oauth, methods = ["POST"])
-app.add_url_rule(f"{API_BASE}/auth/session", "login", view_func = AuthRoute.login, methods = ["POST"])
+app.add_url_rule(f"{API_BASE}/auth/session", "login", view_func = route_limit(AuthRoute.login, "RATE_LIMIT_AUTH_SESSION", get_remote_address, basic_auth_email_key), methods = ["POST"])
 app.add_url_rule(f"{API_BASE}/auth/session", "logout", view_func = AuthRoute.logout, methods = ["DELETE"])
 app.add_url_rule(f"{API_BASE}/users/<user_email>/password", "change_password", view_func = AuthRoute.change_password, methods = ["PATCH"])
 app.add_url_rule(f"{API_BASE}/users/<user_email>/otp/<otp_type>", "send_otp", view_func = AuthRoute.send_otp, methods = ["POST"])
@@ -97,6 +143,7 @@ app.add_url_rule(f"{API_BASE}/users/<user_id>/2fa", "disable_2fa", view_func = A
 app.add_url_rule(f"{API_BASE}/users", "user.view_all", view_func = UserRoute.view_all, methods = ["GET"])
 app.add_url_rule(f"{API_BASE}/users/<user_id>", "user.view", view_func = UserRoute.view, methods = ["GET"])
 app.add_url_rule(f"{API_BASE}/users/<user_id>", "user.update", view_func = UserRoute.update, methods = ["PATCH"])
+app.add_url_rule(f"{API_BASE}/users/credits", "user.bulk_update_credits", view_func = UserRoute.bulk_update_credits, methods = ["POST"])
 app.add_url_rule(f"{API_BASE}/users/<user_id>/credits", "user.update_credits", view_func = UserRoute.update_credits, methods = ["PUT"])
 app.add_url_rule(f"{API_BASE}/users/<user_id>", "user.delete", view_func = UserRoute.delete, methods = ["DELETE"])
 
@@ -107,9 +154,10 @@ app.add_url_rule(f"{API_BASE}/users/<user_id>/transactions/<transaction_id>", "t
 app.add_url_rule(f"{API_BASE}/users/<user_id>/transactions/<transaction_id>", "transactions.delete", view_func = TransactionRoute.delete, methods = ["DELETE"])
 
 app.add_url_rule(f"{API_BASE}/stripe/rate", "stripe.rate", view_func = StripeRoute.rate, methods = ["GET"])
-app.add_url_rule(f"{API_BASE}/stripe/buy", "stripe.buy", view_func = StripeRoute.buy, methods = ["POST"])
+app.add_url_rule(f"{API_BASE}/stripe/buy", "stripe.buy", view_func = route_limit(StripeRoute.buy, "RATE_LIMIT_STRIPE_BUY"), methods = ["POST"])
 app.add_url_rule(f"{API_BASE}/stripe/portal", "stripe.portal", view_func = StripeRoute.portal, methods = ["POST"])
 app.add_url_rule(f"{API_BASE}/stripe/settle", "stripe.settle", view_func = StripeRoute.settle, methods = ["POST"])
 
 app.add_url_rule(f"{API_BASE}/health", "health", view_func = MiscRoute.health, methods = ["GET"])
 app.add_url_rule(f"{API_BASE}/version", "version", view_func = MiscRoute.version, methods = ["GET"])
+app.add_url_rule(f"{API_BASE}/metrics", "metrics", view_func = MiscRoute.metrics, methods = ["GET"])
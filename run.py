@@ -3,13 +3,17 @@
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
-
-from flask_app import app # pylint: disable = C0413
-
 
 
+# Password hashing workers are spawned and re-import this module as __mp_main__,
+# so loading the app stays under the guard or every worker would run setup.
 if __name__ == '__main__':
 
+    load_dotenv()
+
+    # Set before the import, setup reads it while building the services.
     os.environ["ENVIRONMENT"] = "production"
+
+    from flask_app import app # pylint: disable = C0415
+
     app.run(port = os.getenv("API_PORT"))
@@ -0,0 +1,25 @@
+"""
+Stripe Customer Backfill Utility
+
+Creates the Stripe customer of every user that has none yet, for example
+before switching STRIPE_CUSTOMER_PROVISIONING from lazy back to eager.
+"""
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import app.data # pylint: disable = C0413
+from app.services import CustomerProvisioner, Database, Stripe # pylint: disable = C0413
+
+
+
+if __name__ == '__main__':
+
+    Database.initialize()
+
+    app.data.ServiceConfig.stripe = Stripe()
+
+    totals = CustomerProvisioner().backfill()
+
+    print(f"{totals['provisioned']} Stripe customers provisioned, {totals['failed']} failed")
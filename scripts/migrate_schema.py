@@ -0,0 +1,46 @@
+"""
+Schema Migration Utility
+
+Brings a PostgreSQL database created before the nullable Stripe customer id,
+the keyset transaction index and the expiry indexes up to the current models.
+New tables are created by Database.initialize, every statement below is safe to rerun.
+"""
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text # pylint: disable = C0413
+
+import app.data # pylint: disable = C0413
+from app.services import Database # pylint: disable = C0413
+
+
+
+STATEMENTS = [
+    # Customers are provisioned after signup, so users exist without one for a while.
+    "ALTER TABLE users ALTER COLUMN stripe_customer_id DROP NOT NULL",
+    # Keyset pagination of a user's transactions.
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_user_id_created_at_id ON transactions (user_id, created_at, id)",
+    # Expiry sweeps of sessions and OTPs.
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_otps_expires_at ON otps (expires_at)",
+]
+
+
+if __name__ == '__main__':
+
+    Database.initialize()
+
+    if app.data.engine.dialect.name != "postgresql":
+        print(f"Nothing to migrate on {app.data.engine.dialect.name}, tables are created from the current models")
+
+    else:
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+        with app.data.engine.connect().execution_options(isolation_level = "AUTOCOMMIT") as connection:
+
+            for statement in STATEMENTS:
+
+                connection.execute(text(statement))
+                print(statement)
@@ -0,0 +1,21 @@
+"""
+Expiry Sweep Utility
+
+Deletes expired sessions and OTPs once, for use from cron or a scheduled job
+when the in-process sweeper is disabled with EXPIRY_SWEEPER_WORKER=false.
+"""
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services import Database, ExpirySweeper # pylint: disable = C0413
+
+
+
+if __name__ == '__main__':
+
+    Database.initialize()
+
+    for table_name, deleted in ExpirySweeper().sweep().items():
+        print(f"{table_name}: {deleted} expired rows deleted")
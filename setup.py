@@ -1,13 +1,20 @@
 """Setup file for the app."""
 
+import os
+
 import app.data
 from app.services import (
     Authentication,
+    CustomerProvisioner,
     Database,
     Email,
+    EmailQueue,
+    ExpirySweeper,
     OTP,
+    Password,
     Session,
     Stripe,
+    StripeEvents,
     Transaction,
     User
 )
@@ -17,9 +24,26 @@ from app.services import (
 Database.initialize()
 
 app.data.ServiceConfig.authentication = Authentication()
+app.data.ServiceConfig.customer_provisioner = CustomerProvisioner()
 app.data.ServiceConfig.email = Email()
+app.data.ServiceConfig.email_queue = EmailQueue()
+app.data.ServiceConfig.expiry_sweeper = ExpirySweeper()
 app.data.ServiceConfig.otp = OTP()
+app.data.ServiceConfig.password = Password()
 app.data.ServiceConfig.session = Session()
 app.data.ServiceConfig.transaction = Transaction()
 app.data.ServiceConfig.user = User()
 app.data.ServiceConfig.stripe = Stripe()
+app.data.ServiceConfig.stripe_events = StripeEvents()
+
+if os.getenv("EMAIL_QUEUE_WORKER", "true").lower() == "true":
+    app.data.ServiceConfig.email_queue.start_worker()
+
+if os.getenv("STRIPE_CUSTOMER_WORKER", "true").lower() == "true" and not app.data.ServiceConfig.customer_provisioner.lazy:
+    app.data.ServiceConfig.customer_provisioner.start_worker()
+
+if os.getenv("STRIPE_EVENT_WORKER", "true").lower() == "true":
+    app.data.ServiceConfig.stripe_events.start_worker()
+
+if os.getenv("EXPIRY_SWEEPER_WORKER", "true").lower() == "true":
+    app.data.ServiceConfig.expiry_sweeper.start_worker()
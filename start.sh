@@ -4,12 +4,14 @@ set -e
 # Get port from environment or default to 5000
 PORT=${PORT:-5000}
 API_BASE=${API_BASE:-/api/v1}
+GUNICORN_THREADS=${GUNICORN_THREADS:-4}
 
 echo "=========================================="
 echo "Starting Crazi Co Flask Application"
 echo "=========================================="
 echo "PORT: $PORT"
 echo "API_BASE: $API_BASE"
+echo "GUNICORN_THREADS: $GUNICORN_THREADS"
 echo "PYTHONUNBUFFERED: $PYTHONUNBUFFERED"
 echo "=========================================="
 
@@ -17,10 +19,13 @@ echo "=========================================="
 export PORT
 
 # Start gunicorn with logging
+# Threaded workers keep serving other requests while a thread waits on the password hashing pool
 exec gunicorn \
     --bind=0.0.0.0:$PORT \
     --timeout=600 \
     --workers=4 \
+    --worker-class=gthread \
+    --threads=$GUNICORN_THREADS \
     --access-logfile - \
     --error-logfile - \
     --log-level info \
@@ -0,0 +1,85 @@
+"""Shared test fixtures.
+
+Tests run against a throwaway SQLite file unless DATABASE_DSN points at a real
+database, background workers are off and emails go to the stub transport.
+"""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+
+
+
+TEST_ENVIRONMENT = {
+    "API_BASE": "/api/v1",
+    "DATABASE_DSN": f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}",
+    "AUTHORIZATION_HEADER": "Authorization",
+    "PUBLIC_ROLE": "public",
+    "PRIVATE_ROLE": "private",
+    "USER_ROLE": "user",
+    "PUBLIC_API_KEY": "test-public-key",
+    "PRIVATE_API_KEY": "test-private-key",
+    "JWT_SECRET_KEY": "test-jwt-secret-of-at-least-32-bytes",
+    "JWT_ALGORITHM": "HS256",
+    "BCRYPT_ROUNDS": "4",
+    "PASSWORD_HASH_WORKERS": "0",
+    "OTP_EXPIRY_IN_MINUTES": "10",
+    "SESSION_EXPIRY_IN_DAYS": "30",
+    "EMAIL_TRANSPORT": "stub",
+    "EMAIL_QUEUE_WORKER": "false",
+    "EXPIRY_SWEEPER_WORKER": "false",
+    "STRIPE_CUSTOMER_WORKER": "false",
+    "STRIPE_EVENT_WORKER": "false",
+    "RATE_LIMIT": "10000 per minute",
+    "ENVIRONMENT": "testing",
+}
+
+for key, value in TEST_ENVIRONMENT.items():
+    os.environ.setdefault(key, value)
+
+os.makedirs(os.path.join("app", "logs"), exist_ok = True)
+
+import flask_app # pylint: disable = C0413
+import app.data # pylint: disable = C0413
+from app.schemas import User as UserModel # pylint: disable = C0413
+from app.services import Database # pylint: disable = C0413
+
+
+
+@pytest.fixture
+def client():
+    """Flask test client."""
+
+    return flask_app.app.test_client()
+
+
+@pytest.fixture
+def public_headers():
+    """Headers for the public API key."""
+
+    return {os.getenv("AUTHORIZATION_HEADER"): os.getenv("PUBLIC_API_KEY")}
+
+
+@pytest.fixture
+def private_headers():
+    """Headers for the private API key."""
+
+    return {os.getenv("AUTHORIZATION_HEADER"): os.getenv("PRIVATE_API_KEY")}
+
+
+@pytest.fixture
+def user():
+    """A freshly inserted, active user."""
+
+    user = UserModel.model_validate({
+        "first_name": "Test",
+        "last_name": "User",
+        "email": f"{uuid.uuid4().hex}@example.com",
+        "password": app.data.ServiceConfig.password.hash("password123"),
+        "google_user_id": None,
+        "is_active": True,
+    })
+
+    return Database(UserModel).insert(user)
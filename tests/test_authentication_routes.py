@@ -0,0 +1,54 @@
+"""Authentication route tests."""
+
+import os
+import uuid
+
+from sqlmodel import select, Session as SQLModelSession
+
+import app.data
+from app.schemas import OutboundEmail as OutboundEmailModel, Transaction as TransactionModel
+
+
+
+API_BASE = os.getenv("API_BASE")
+
+
+def test_register_creates_user_with_signup_credits(client, public_headers):
+    """Registering returns the new user, records the signup bonus and queues the welcome email."""
+
+    email = f"{uuid.uuid4().hex}@example.com"
+
+    response = client.post(f"{API_BASE}/auth/register", headers = public_headers, json = {
+        "first_name": "new",
+        "last_name": "user",
+        "email": email,
+        "password": "password123",
+    })
+
+    assert response.status_code == 201, response.get_json()
+
+    user = response.get_json()["data"]
+
+    assert user["email"] == email
+    assert user["first_name"] == "New"
+
+    with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+        transactions = session.exec(select(TransactionModel).where(TransactionModel.user_id == user["id"])).all()
+        emails = session.exec(select(OutboundEmailModel).where(OutboundEmailModel.recipient == email)).all()
+
+    assert [(transaction.value_in_credits, transaction.stripe_payment_intent) for transaction in transactions] == [(100, None)]
+    assert len(emails) == 1
+
+
+def test_register_rejects_existing_email(client, public_headers, user):
+    """Registering an email that is already taken is a presence error."""
+
+    response = client.post(f"{API_BASE}/auth/register", headers = public_headers, json = {
+        "first_name": "Other",
+        "last_name": "User",
+        "email": user.email,
+        "password": "password123",
+    })
+
+    assert response.status_code == 400
+    assert "already exists" in response.get_json()["message"]
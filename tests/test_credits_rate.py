@@ -0,0 +1,55 @@
+"""Credits rate tests."""
+
+import pytest
+
+from app.utils.credits_rate import build_snapshot, CreditsRate
+
+
+
+TIERS = [
+    {"lower_limit": 100, "upper_limit": 999, "rate": 0.9},
+    {"lower_limit": 1, "upper_limit": 99, "rate": 1.0},
+    {"lower_limit": 1000, "upper_limit": 10000, "rate": 0.8},
+]
+
+
+def test_build_snapshot_sorts_tiers():
+    """Tiers are sorted by lower limit whatever order they are given in."""
+
+    snapshot = build_snapshot(TIERS)
+
+    assert snapshot.lower_limits == (1, 100, 1000)
+
+
+@pytest.mark.parametrize("tiers", [
+    [{"lower_limit": 1, "upper_limit": 100, "rate": 1.0}, {"lower_limit": 100, "upper_limit": 200, "rate": 0.9}],
+    [{"lower_limit": 1, "upper_limit": 500, "rate": 1.0}, {"lower_limit": 100, "upper_limit": 200, "rate": 0.9}],
+    [{"lower_limit": 100, "upper_limit": 200, "rate": 0.9}, {"lower_limit": 1, "upper_limit": 150, "rate": 1.0}],
+])
+def test_build_snapshot_rejects_overlapping_tiers(tiers):
+    """Tiers sharing any amount, including a shared boundary, are rejected."""
+
+    with pytest.raises(ValueError, match = "Overlapping"):
+        build_snapshot(tiers)
+
+
+@pytest.mark.parametrize("tier", [
+    {"lower_limit": 1, "upper_limit": 100},
+    {"lower_limit": "1", "upper_limit": 100, "rate": 1.0},
+    {"lower_limit": 100, "upper_limit": 1, "rate": 1.0},
+    {"lower_limit": 1, "upper_limit": 100, "rate": 0},
+])
+def test_build_snapshot_rejects_malformed_tiers(tier):
+    """Missing, non numeric, inverted or non positive values are rejected."""
+
+    with pytest.raises(ValueError):
+        build_snapshot([tier])
+
+
+@pytest.mark.parametrize("amount, rate", [(1, 1.0), (99, 1.0), (100, 0.9), (999, 0.9), (10000, 0.8), (0, None), (99.5, None), (10001, None)])
+def test_lookup_finds_the_covering_tier(amount, rate):
+    """Amounts resolve to their tier, amounts outside every tier to None."""
+
+    tier = CreditsRate(TIERS).lookup(amount)
+
+    assert (tier["rate"] if tier else None) == rate
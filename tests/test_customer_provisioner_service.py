@@ -0,0 +1,39 @@
+"""Customer provisioner service tests."""
+
+from types import SimpleNamespace
+
+import app.data
+from app.error_handing import StripeError
+from app.schemas import User as UserModel
+
+
+
+def test_reconcile_backs_off_failing_users(monkeypatch, user):
+    """A user whose customer cannot be created is skipped until its backoff ends, then provisioned."""
+
+    provisioner = app.data.ServiceConfig.customer_provisioner
+    attempted = []
+
+    def failing_create_customer(*_args, user_id = None):
+        attempted.append(user_id)
+        raise StripeError("create_customer")
+
+    monkeypatch.setattr(provisioner, "batch_size", 1000)
+    monkeypatch.setattr(provisioner, "failures", {})
+    monkeypatch.setattr(app.data.ServiceConfig.stripe, "create_customer", failing_create_customer)
+
+    assert provisioner.reconcile() == 0
+    assert user.id in attempted
+    assert provisioner.failures[user.id][0] == 1
+
+    attempted.clear()
+
+    assert provisioner.reconcile() == 0
+    assert not attempted
+
+    monkeypatch.setattr(app.data.ServiceConfig.stripe, "create_customer", lambda *_args, user_id = None: SimpleNamespace(id = f"cus_{user_id}"))
+    provisioner.failures[user.id] = (1, 0.0)
+
+    assert provisioner.reconcile() >= 1
+    assert user.id not in provisioner.failures
+    assert app.data.ServiceConfig.user.view(user.id, UserModel.id).stripe_customer_id == f"cus_{user.id}"
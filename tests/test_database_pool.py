@@ -0,0 +1,35 @@
+"""Database pool tests."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from app.utils.database_pool import InstrumentedQueuePool, pool_statistics
+
+
+
+def test_only_pool_exhaustion_counts_as_a_timeout(tmp_path):
+    """A checkout that times out is counted, a failing connect is not."""
+
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(tmp_path / "pool.db", check_same_thread = False), pool_size = 1, max_overflow = 0, timeout = 0.01)
+    timeouts = pool_statistics.snapshot()["timeouts"]
+
+    held = pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    held.close()
+
+    assert pool_statistics.snapshot()["timeouts"] == timeouts + 1
+
+    def failing_connect():
+        raise sqlite3.OperationalError("password authentication failed")
+
+    failing_pool = InstrumentedQueuePool(failing_connect, pool_size = 1, max_overflow = 0, timeout = 0.01)
+
+    with pytest.raises((sqlite3.OperationalError, OperationalError)):
+        failing_pool.connect()
+
+    assert pool_statistics.snapshot()["timeouts"] == timeouts + 1
@@ -0,0 +1,46 @@
+"""Email queue service tests."""
+
+from datetime import datetime, timedelta, timezone
+import uuid
+
+from sqlmodel import Session as SQLModelSession, update
+
+import app.data
+from app.schemas import OutboundEmail as OutboundEmailModel
+from app.schemas.database.outbound_email import OutboundEmailStatus, OutboundEmailType
+
+
+
+def test_drain_sends_due_emails_and_fails_bad_payloads():
+    """Deliverable emails reach the transport, a payload the sender rejects fails without stopping the batch."""
+
+    recipient = f"{uuid.uuid4().hex}@example.com"
+    client = app.data.ServiceConfig.email.client
+
+    broken = app.data.ServiceConfig.email_queue.enqueue(OutboundEmailType.OTP, recipient, unexpected = "value")
+    sent = app.data.ServiceConfig.email_queue.enqueue(OutboundEmailType.OTP, recipient, code = "123456")
+
+    # SQLite's now() has second precision, make both emails unambiguously due.
+    with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+        session.exec(
+            update(OutboundEmailModel)
+            .where(OutboundEmailModel.id.in_([broken.id, sent.id]))
+            .values(next_attempt_at = datetime.now(timezone.utc) - timedelta(minutes = 1))
+        )
+        session.commit()
+
+    client.clear()
+    app.data.ServiceConfig.email_queue.drain()
+
+    with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+        broken = session.get(OutboundEmailModel, broken.id)
+        sent = session.get(OutboundEmailModel, sent.id)
+
+    assert broken.status == OutboundEmailStatus.FAILED
+    assert broken.payload is None
+    assert "unexpected" in broken.last_error
+
+    assert sent.status == OutboundEmailStatus.SENT
+    assert sent.payload is None
+    # Emails queued by other tests may go out in the same drain.
+    assert len([message for message in client.sent if message["Destination"]["ToAddresses"] == [recipient]]) == 1
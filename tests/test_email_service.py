@@ -0,0 +1,46 @@
+"""Email service tests."""
+
+import pytest
+
+import app.data
+from app.error_handing import AWSError
+
+
+
+RECIPIENTS = [(f"user{index}@example.com", {"index": index}) for index in range(120)]
+
+
+def test_bulk_send_batches_destinations():
+    """Recipients are sent 50 destinations per call and every one gets a result."""
+
+    client = app.data.ServiceConfig.email.client
+    client.clear()
+
+    results = app.data.ServiceConfig.email.bulk_send("Announcement", RECIPIENTS)
+
+    assert [len(message["Destinations"]) for message in client.sent] == [50, 50, 20]
+    assert [result["recipient"] for result in results] == [to for to, _ in RECIPIENTS]
+    assert all(result["status"] == "Success" for result in results)
+
+
+def test_bulk_send_reports_only_failures_in_context(monkeypatch):
+    """A partial failure logs the failed recipients and keeps the full results on the error."""
+
+    client = app.data.ServiceConfig.email.client
+    send_bulk_templated_email = client.send_bulk_templated_email
+
+    def reject_first(**kwargs):
+        response = send_bulk_templated_email(**kwargs)
+        response["Status"][0] = {"Status": "MessageRejected", "Error": "Rejected"}
+        return response
+
+    monkeypatch.setattr(client, "send_bulk_templated_email", reject_first)
+
+    with pytest.raises(AWSError) as error:
+        app.data.ServiceConfig.email.bulk_send("Announcement", RECIPIENTS)
+
+    failures = error.value.context["failures"]
+
+    assert [failure["recipient"] for failure in failures] == ["user0@example.com", "user50@example.com", "user100@example.com"]
+    assert "results" not in error.value.context
+    assert len(error.value.results) == len(RECIPIENTS)
@@ -0,0 +1,28 @@
+"""Expiry sweeper service tests."""
+
+import threading
+
+from app.services import ExpirySweeper
+
+
+
+def test_worker_sweeps_immediately_and_stops(monkeypatch):
+    """The first sweep does not wait a full interval and stop ends the thread."""
+
+    sweeper = ExpirySweeper()
+    swept = threading.Event()
+
+    def sweep():
+        swept.set()
+        return {"sessions": 0, "otps": 0}
+
+    monkeypatch.setattr(sweeper, "interval", 3600)
+    monkeypatch.setattr(sweeper, "sweep", sweep)
+
+    sweeper.start_worker()
+
+    assert swept.wait(5)
+
+    sweeper.stop(timeout = 5)
+
+    assert not sweeper.worker.is_alive()
@@ -0,0 +1,20 @@
+"""Query instrumentation tests."""
+
+from app.utils.query_instrumentation import QueryHistogram
+
+
+
+def test_record_counts_statements_over_the_slow_threshold():
+    """Durations at or above the threshold are slow and counted as such."""
+
+    histogram = QueryHistogram(slow_ms = 50)
+
+    assert histogram.record(49.9) is False
+    assert histogram.record(50) is True
+    assert histogram.record(3000) is True
+
+    snapshot = histogram.snapshot()
+
+    assert (snapshot["count"], snapshot["slow"]) == (3, 2)
+    assert snapshot["buckets"]["le_50ms"] == 2
+    assert snapshot["buckets"]["inf"] == 0
@@ -0,0 +1,45 @@
+"""Rate limit storage tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import time
+
+import pytest
+
+from app.utils.rate_limit_storage import SQLiteStorage
+
+
+
+def test_incr_counts_within_the_window_and_restarts_after_expiry():
+    """Counters add up until their window ends, then start again from zero."""
+
+    storage = SQLiteStorage(f"sqlite://{os.path.join(tempfile.mkdtemp(), 'limits.db')}")
+
+    assert storage.incr("caller", 1) == 1
+    assert storage.incr("caller", 1, amount = 2) == 3
+    assert storage.get("caller") == 3
+
+    time.sleep(1.1)
+
+    assert storage.get("caller") == 0
+    assert storage.incr("caller", 1) == 1
+
+
+@pytest.mark.parametrize("uri", ["sqlite://", "sqlite:///:memory:"])
+def test_in_memory_databases_are_rejected(uri):
+    """Per thread connections cannot share an in-memory database."""
+
+    with pytest.raises(ValueError):
+        SQLiteStorage(uri)
+
+
+def test_counters_are_shared_between_threads():
+    """Every thread sees the same counters, whichever thread created the storage."""
+
+    storage = SQLiteStorage(f"sqlite://{os.path.join(tempfile.mkdtemp(), 'limits.db')}")
+
+    with ThreadPoolExecutor(max_workers = 4) as executor:
+        list(executor.map(lambda _: storage.incr("caller", 60), range(20)))
+
+    assert storage.get("caller") == 20
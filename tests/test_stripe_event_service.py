@@ -0,0 +1,33 @@
+"""Stripe event service tests."""
+
+import json
+
+import stripe
+
+from app.services import StripeEvents
+
+
+
+def test_payload_keeps_plain_json_for_settling():
+    """The stored payload holds the payment intent and metadata as plain, serializable values."""
+
+    event = stripe.Event.construct_from({
+        "id": "evt_test",
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {
+                "id": "cs_test",
+                "payment_intent": "pi_test",
+                "customer_email": "user@example.com",
+                "metadata": {"user_id": "user_test", "value_in_credits": "500", "value_in_fiat": "5"},
+            },
+        },
+    }, "sk_test")
+
+    payload = StripeEvents.payload(event)
+
+    assert payload == {
+        "payment_intent": "pi_test",
+        "metadata": {"user_id": "user_test", "value_in_credits": "500", "value_in_fiat": "5"},
+    }
+    assert json.loads(json.dumps(payload)) == payload
@@ -0,0 +1,28 @@
+"""Stripe route tests."""
+
+import os
+
+import app.data
+
+
+
+API_BASE = os.getenv("API_BASE")
+
+
+def test_buy_reports_a_user_without_customer_as_missing(client, monkeypatch, user):
+    """A user whose Stripe customer cannot be resolved is a 404, not a malformed body."""
+
+    def missing_customer(_user):
+        raise ValueError
+
+    monkeypatch.setattr(app.data.ServiceConfig.customer_provisioner, "customer_id", missing_customer)
+
+    session = app.data.ServiceConfig.session.create(user.id)
+
+    response = client.post(
+        f"{API_BASE}/stripe/buy",
+        headers = {os.getenv("AUTHORIZATION_HEADER"): f"Bearer crazi_couser_{session.token}"},
+        json = {"amount": 10, "return_path": "/credits"}
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,48 @@
+"""Token cache tests."""
+
+from types import SimpleNamespace
+
+from app.utils.token_cache import TokenCache
+
+
+
+def consistent_cache():
+    """A cache that behaves as if cross worker invalidations were being received."""
+
+    cache = TokenCache(10, 60)
+    cache.is_consistent = lambda: True
+
+    return cache
+
+
+def test_invalidation_with_a_session_is_published_on_it():
+    """Invalidations drop local entries and are queued on the caller's session, never on their own."""
+
+    cache = consistent_cache()
+    published = []
+    cache.publish = lambda session, message: published.append((session, message))
+
+    user = SimpleNamespace(id = "user_test")
+    cache.set("token", SimpleNamespace(), user)
+
+    session = object()
+    cache.invalidate_user(user.id, session)
+
+    assert cache.get("token") is None
+    assert published == [(session, "user:user_test")]
+
+    cache.invalidate_token("other")
+
+    assert len(published) == 1
+
+
+def test_set_skips_rows_loaded_before_an_invalidation():
+    """Rows read before an invalidation landed are not cached."""
+
+    cache = consistent_cache()
+    generation = cache.generation
+
+    cache.apply("user:user_test")
+    cache.set("token", SimpleNamespace(), SimpleNamespace(id = "user_test"), generation)
+
+    assert cache.get("token") is None
@@ -0,0 +1,56 @@
+"""Transaction service tests."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import app.data
+from app.schemas.database.transaction import TransactionType
+from app.services import Transaction
+
+
+
+def test_cursor_round_trip():
+    """A cursor decodes back to the position it was encoded from."""
+
+    # Cursors are also encoded from projected rows, anything with the two attributes works.
+    transaction = SimpleNamespace(
+        id = "transaction_0123456789abcdef0123456789abcdef",
+        created_at = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo = timezone.utc),
+    )
+
+    cursor = Transaction.encode_cursor(transaction)
+
+    assert "=" not in cursor
+    assert Transaction.decode_cursor(cursor) == (transaction.created_at, transaction.id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bnVsbA", "WzFd"])
+def test_decode_cursor_rejects_malformed_cursors(cursor):
+    """Malformed cursors raise ValueError, which the route maps to a schema error."""
+
+    with pytest.raises(ValueError):
+        Transaction.decode_cursor(cursor)
+
+
+def test_view_page_walks_every_transaction_once(user):
+    """Following next cursors visits each transaction exactly once, newest first."""
+
+    for index in range(7):
+        app.data.ServiceConfig.transaction.create(user.id, None, f"Transaction {index}.", index + 1, 0.01, TransactionType.CREDIT)
+
+    seen = []
+    cursor = None
+
+    while True:
+
+        page, cursor = app.data.ServiceConfig.transaction.view_page(user.id, 3, cursor)
+        seen.extend(page)
+
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({transaction.id for transaction in seen}) == 7
+    assert [transaction.created_at for transaction in seen] == sorted((transaction.created_at for transaction in seen), reverse = True)
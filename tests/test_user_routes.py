@@ -0,0 +1,39 @@
+"""User route tests."""
+
+import os
+
+from sqlalchemy.exc import OperationalError
+
+import app.data
+
+
+
+API_BASE = os.getenv("API_BASE")
+
+
+def test_bulk_update_credits_succeeds_when_every_chunk_is_written(client, private_headers, user):
+    """Applied and not found items are a complete outcome."""
+
+    response = client.post(f"{API_BASE}/users/credits", headers = private_headers, json = {
+        "adjustments": [{"user_id": user.id, "delta": 5}, {"user_id": "user_missing", "delta": 5}],
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]["applied"] == 1
+
+
+def test_bulk_update_credits_reports_failed_chunks(client, monkeypatch, private_headers, user):
+    """A chunk that cannot be written turns the response into a 207 with the failures counted."""
+
+    def failing_chunk(*_args):
+        raise OperationalError("UPDATE users", {}, Exception("database is unavailable"))
+
+    monkeypatch.setattr(app.data.ServiceConfig.user, "_apply_credit_chunk", failing_chunk)
+
+    response = client.post(f"{API_BASE}/users/credits", headers = private_headers, json = {
+        "adjustments": [{"user_id": user.id, "delta": 5}],
+    })
+
+    assert response.status_code == 207
+    assert response.get_json()["data"]["failed"] == 1
+    assert response.get_json()["data"]["results"][0]["status"] == "failed"
@@ -0,0 +1,80 @@
+"""User service tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+import uuid
+
+from sqlmodel import select, Session as SQLModelSession
+
+import app.data
+from app.schemas import Transaction as TransactionModel, User as UserModel
+from app.schemas.database.transaction import TransactionType
+
+
+
+def test_parallel_update_credits_keeps_balance_and_ledger_consistent(user):
+    """Concurrent credits and debits on one user lose no update and write one ledger row each."""
+
+    adjustments = [(2, TransactionType.CREDIT), (1, TransactionType.DEBIT)] * 50
+
+    def adjust(adjustment):
+        amount, transaction_type = adjustment
+        return app.data.ServiceConfig.user.update_credits(user.id, UserModel.id, amount, transaction_type = transaction_type)
+
+    with ThreadPoolExecutor(max_workers = 8) as executor:
+        list(executor.map(adjust, adjustments))
+
+    assert app.data.ServiceConfig.user.view(user.id, UserModel.id).credits == user.credits + 50
+
+    with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+        transactions = session.exec(select(TransactionModel).where(TransactionModel.user_id == user.id)).all()
+
+    assert len(transactions) == len(adjustments)
+    assert sum(transaction.value_in_credits for transaction in transactions if transaction.type == TransactionType.DEBIT) == 50
+
+
+def test_bulk_update_credits_rejects_non_finite_deltas(user):
+    """NaN and infinite deltas are reported invalid and never reach the balance."""
+
+    results = app.data.ServiceConfig.user.bulk_update_credits([
+        {"user_id": user.id, "delta": "NaN"},
+        {"user_id": user.id, "delta": "Infinity"},
+        {"user_id": user.id, "delta": float("-inf")},
+    ])
+
+    assert [result["status"] for result in results] == ["invalid"] * 3
+    assert app.data.ServiceConfig.user.view(user.id, UserModel.id).credits == user.credits
+
+
+def test_signup_activates_google_users():
+    """Google sign-ups are created active with their Google id and no OTP."""
+
+    user, session, otp = app.data.ServiceConfig.user.signup(
+        "google user", None, f"{uuid.uuid4().hex}@example.com", uuid.uuid4().hex, google_user_id = "google-123", is_active = True
+    )
+
+    assert user.is_active and user.google_user_id == "google-123"
+    assert user.first_name == "Google User"
+    assert session.user_id == user.id
+    assert otp is None
+
+
+def test_bulk_update_credits_applies_sums_and_reports_missing_users(user):
+    """Deltas are applied and ledgered per item, repeated users sum up and unknown users are not_found."""
+
+    results = app.data.ServiceConfig.user.bulk_update_credits([
+        {"user_id": user.id, "delta": 10},
+        {"user_id": "user_missing", "delta": 5},
+        {"user_id": user.id, "delta": -3, "description": "Correction."},
+    ])
+
+    assert [result["status"] for result in results] == ["applied", "not_found", "applied"]
+    assert app.data.ServiceConfig.user.view(user.id, UserModel.id).credits == user.credits + 7
+
+    with SQLModelSession(app.data.engine) as session:  # pylint: disable=E1129
+        transactions = session.exec(select(TransactionModel).where(TransactionModel.user_id == user.id)).all()
+
+    assert sorted(transaction.id for transaction in transactions) == sorted(results[index]["transaction_id"] for index in (0, 2))
+    assert sorted((transaction.type, transaction.value_in_credits) for transaction in transactions) == [
+        (TransactionType.CREDIT, 10),
+        (TransactionType.DEBIT, 3),
+    ]